@@ -5,7 +5,7 @@ pacong.browser - 浏览器控制模块
 
 from .applescript import execute_applescript, chrome_applescript_scraper
 from .cdp import CDPController
-from .selenium_controller import SeleniumController
+from .selenium_controller import SeleniumController, SeleniumControllerPool, get_shared_pool
 from .rpa_chrome_controller import (
     RPAChromeMCP, 
     ControllerType, 
@@ -19,6 +19,8 @@ __all__ = [
     'chrome_applescript_scraper', 
     'CDPController',
     'SeleniumController',
+    'SeleniumControllerPool',
+    'get_shared_pool',
     'RPAChromeMCP',
     'ControllerType',
     'create_rpa_controller',
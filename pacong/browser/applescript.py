@@ -3,7 +3,9 @@ AppleScript浏览器控制模块
 提供通过AppleScript控制Chrome浏览器的功能
 """
 
+import os
 import subprocess
+import tempfile
 import time
 import logging
 from typing import Optional
@@ -67,7 +69,7 @@ def chrome_applescript_scraper(url: str, wait_seconds: int = 15, scroll_times: i
     
     Args:
         url: 目标URL
-        wait_seconds: 等待页面加载的时间
+        wait_seconds: 等待页面加载的最长时间，页面加载完成即提前返回
         scroll_times: 滚动次数
         
     Returns:
@@ -106,39 +108,70 @@ def chrome_applescript_scraper(url: str, wait_seconds: int = 15, scroll_times: i
         except Exception as e:
             logger.warning(f"窗口调整失败，继续使用默认窗口: {e}")
         
-        # 3. 等待页面加载
-        logger.info(f"等待页面加载 ({wait_seconds}秒)...")
-        time.sleep(wait_seconds)
+        # 3. 等待页面加载：在同一个AppleScript进程内轮询document.readyState，加载完成即返回
+        logger.info(f"等待页面加载 (最长{wait_seconds}秒)...")
+        wait_script = f'''
+        tell application "Google Chrome"
+            repeat {max(1, wait_seconds * 2)} times
+                if (execute active tab of front window javascript "document.readyState") is "complete" then exit repeat
+                delay 0.5
+            end repeat
+        end tell
+        '''
+        execute_applescript(wait_script, timeout=wait_seconds + 30)
         
-        # 4. 滚动页面加载所有数据
+        # 4. 滚动页面加载所有数据（所有滚动在一次osascript调用中完成）
         if scroll_times > 0:
             logger.info(f"滚动页面加载完整数据...")
             
             try:
-                for i in range(scroll_times):
-                    scroll_script = '''
-                    tell application "Google Chrome" 
+                # 每次滚动后轮询页面高度，连续3次（0.6秒）不变即认为懒加载完成，最长等待2秒
+                scroll_script = f'''
+                tell application "Google Chrome"
+                    repeat {scroll_times} times
                         execute active tab of front window javascript "window.scrollBy(0, window.innerHeight);"
-                    end tell
-                    '''
-                    execute_applescript(scroll_script)
-                    logger.info(f"第 {i+1}/{scroll_times} 次滚动完成")
-                    time.sleep(2)
-                
-                logger.info("再等待5秒确保数据加载完毕...")
-                time.sleep(5)
+                        set lastHeight to -1
+                        set stableCount to 0
+                        repeat 10 times
+                            delay 0.2
+                            set pageHeight to (execute active tab of front window javascript "document.body.scrollHeight")
+                            if pageHeight = lastHeight then
+                                set stableCount to stableCount + 1
+                                if stableCount >= 3 then exit repeat
+                            else
+                                set stableCount to 0
+                                set lastHeight to pageHeight
+                            end if
+                        end repeat
+                    end repeat
+                end tell
+                '''
+                execute_applescript(scroll_script, timeout=scroll_times * 2 + 30)
+                logger.info(f"{scroll_times} 次滚动完成")
                 
             except Exception as e:
                 logger.warning(f"滚动失败，可能只获取到部分数据: {e}")
         
-        # 5. 获取页面HTML
+        # 5. 获取页面HTML：由AppleScript直接写入临时文件，避免数MB的HTML经osascript标准输出管道传输
         logger.info("获取页面HTML内容...")
-        get_html_script = '''
-        tell application "Google Chrome" 
-            execute active tab of front window javascript "document.documentElement.outerHTML"
-        end tell
-        '''
-        html_content = execute_applescript(get_html_script)
+        fd, html_path = tempfile.mkstemp(suffix='.html')
+        os.close(fd)
+        try:
+            get_html_script = f'''
+            tell application "Google Chrome"
+                set pageHtml to (execute active tab of front window javascript "document.documentElement.outerHTML")
+            end tell
+            set htmlFile to open for access (POSIX file "{html_path}") with write permission
+            try
+                set eof of htmlFile to 0
+                write pageHtml to htmlFile as «class utf8»
+            end try
+            close access htmlFile
+            '''
+            execute_applescript(get_html_script)
+            html_content = Path(html_path).read_bytes().decode('utf-8', errors='replace')
+        finally:
+            os.unlink(html_path)
         
         if not html_content:
             logger.error("未能获取到HTML内容")
@@ -4,12 +4,14 @@ Chrome DevTools Protocol (CDP) 控制器
 """
 
 import asyncio
+import itertools
 import json
 import requests
 import websockets
 import subprocess
 import tempfile
 import shutil
+import time
 import logging
 from typing import Optional, Dict, Any
 from pathlib import Path
@@ -26,6 +28,8 @@ class CDPController:
         self.base_url = f"http://localhost:{debug_port}"
         self.chrome_process = None
         self.temp_dir = None
+        # 调试端口的HTTP接口（/json/*）复用同一个会话的keep-alive连接
+        self.http = requests.Session()
         
     def start_chrome(self, headless: bool = True) -> bool:
         """
@@ -62,14 +66,14 @@ class CDPController:
                 stderr=subprocess.PIPE
             )
             
-            # 等待Chrome启动
+            # 等待Chrome启动：短间隔轮询调试端口，就绪即返回
             max_wait_seconds = 15
-            for i in range(max_wait_seconds):
+            deadline = time.monotonic() + max_wait_seconds
+            while time.monotonic() < deadline:
                 if self.is_chrome_running():
                     logger.info("Chrome调试端口已就绪")
                     return True
-                import time
-                time.sleep(1)
+                time.sleep(0.1)
             
             logger.error(f"在 {max_wait_seconds} 秒内无法连接到Chrome调试端口")
             return False
@@ -86,7 +90,7 @@ class CDPController:
             bool: 是否可用
         """
         try:
-            response = requests.get(f"{self.base_url}/json/version", timeout=1)
+            response = self.http.get(f"{self.base_url}/json/version", timeout=1)
             return response.status_code == 200
         except:
             return False
@@ -102,6 +106,8 @@ class CDPController:
         if self.temp_dir and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
             logger.info("清理临时目录")
+        
+        self.http.close()
     
     async def scrape_page(self, url: str, wait_seconds: int = 15) -> str:
         """
@@ -109,7 +115,7 @@ class CDPController:
         
         Args:
             url: 目标URL
-            wait_seconds: 等待时间
+            wait_seconds: 加载事件后等待动态内容的最长时间
             
         Returns:
             str: 页面HTML内容
@@ -117,7 +123,7 @@ class CDPController:
         tab = None
         try:
             # 创建新标签页
-            response = requests.put(f"{self.base_url}/json/new")
+            response = self.http.put(f"{self.base_url}/json/new")
             response.raise_for_status()
             tab = response.json()
             ws_url = tab['webSocketDebuggerUrl']
@@ -152,9 +158,9 @@ class CDPController:
                         logger.warning("等待页面加载事件超时，继续...")
                         break
 
-                # 等待动态内容加载
-                logger.info(f"等待 {wait_seconds} 秒让动态内容加载...")
-                await asyncio.sleep(wait_seconds)
+                # 等待动态内容加载：DOM连续几次不再变化即认为稳定，最多等待wait_seconds秒
+                logger.info(f"等待动态内容稳定（最长 {wait_seconds} 秒）...")
+                await self._wait_for_content_settle(websocket, wait_seconds)
 
                 # 获取页面HTML
                 logger.info("获取页面HTML内容...")
@@ -183,11 +189,60 @@ class CDPController:
             # 关闭标签页
             if tab and tab.get('id'):
                 try:
-                    requests.delete(f"{self.base_url}/json/close/{tab['id']}")
+                    self.http.delete(f"{self.base_url}/json/close/{tab['id']}")
                     logger.info(f"已关闭标签页: {tab['id']}")
                 except:
                     pass
     
+    async def _wait_for_content_settle(self, websocket, timeout: float,
+                                       interval: float = 0.5, stable_checks: int = 3) -> bool:
+        """
+        轮询DOM大小，连续stable_checks次不变时认为动态内容已加载完成
+        
+        Args:
+            websocket: 已连接的标签页WebSocket
+            timeout: 最长等待时间（秒）
+            interval: 轮询间隔（秒）
+            stable_checks: 需要连续保持不变的次数
+            
+        Returns:
+            bool: 是否在超时前稳定
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        message_ids = itertools.count(100)
+        last_size = None
+        stable = 0
+        
+        while loop.time() < deadline:
+            msg_id = next(message_ids)
+            await websocket.send(json.dumps({
+                "id": msg_id,
+                "method": "Runtime.evaluate",
+                "params": {"expression": "document.documentElement.innerHTML.length"}
+            }))
+            
+            # 跳过期间到达的事件消息，只取本次求值的结果
+            try:
+                while True:
+                    data = json.loads(await asyncio.wait_for(websocket.recv(), timeout=max(deadline - loop.time(), 0.1)))
+                    if data.get('id') == msg_id:
+                        break
+            except asyncio.TimeoutError:
+                return False
+            
+            size = data.get('result', {}).get('result', {}).get('value')
+            if size is not None and size == last_size:
+                stable += 1
+                if stable >= stable_checks:
+                    return True
+            else:
+                stable = 0
+            last_size = size
+            await asyncio.sleep(interval)
+        
+        return False
+    
     async def execute_javascript(self, tab_id: str, js_code: str) -> Any:
         """
         在指定标签页执行JavaScript
@@ -201,7 +256,7 @@ class CDPController:
         """
         try:
             # 获取WebSocket URL
-            response = requests.get(f"{self.base_url}/json")
+            response = self.http.get(f"{self.base_url}/json")
             tabs = response.json()
             
             target_tab = None
@@ -240,7 +295,7 @@ class CDPController:
             list: 标签页信息列表
         """
         try:
-            response = requests.get(f"{self.base_url}/json")
+            response = self.http.get(f"{self.base_url}/json")
             return response.json()
         except Exception as e:
             logger.error(f"获取标签页列表失败: {e}")
@@ -261,7 +316,7 @@ class CDPController:
             if url:
                 endpoint += f"?{url}"
             
-            response = requests.put(endpoint)
+            response = self.http.put(endpoint)
             response.raise_for_status()
             
             tab_info = response.json()
@@ -283,7 +338,7 @@ class CDPController:
             bool: 是否成功关闭
         """
         try:
-            response = requests.delete(f"{self.base_url}/json/close/{tab_id}")
+            response = self.http.delete(f"{self.base_url}/json/close/{tab_id}")
             success = response.status_code == 200
             if success:
                 logger.info(f"已关闭标签页: {tab_id}")
@@ -4,8 +4,13 @@ Selenium浏览器控制器
 """
 
 import time
+import queue
+import atexit
 import logging
-from typing import Optional, List
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional, List, Dict, Iterator
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -13,6 +18,44 @@ from selenium.common.exceptions import WebDriverException, TimeoutException
 
 logger = logging.getLogger(__name__)
 
+# 爬取只需要DOM文本，禁止加载图片和样式表以减少页面加载时间和流量
+BLOCKED_CONTENT_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+}
+
+# 在页面内按容器提取字段: arguments[0]为容器选择器, arguments[1]为 {字段: [选择器, 属性]}
+# 文本与BeautifulSoup的get_text(strip=True)一致：逐个文本节点去除首尾空白后直接拼接，跳过script/style/template
+EXTRACT_ELEMENTS_SCRIPT = """
+const [containerSelector, fields] = arguments;
+const SKIPPED_TAGS = new Set(['script', 'style', 'template']);
+const textOf = node => {
+    let text = '';
+    for (const child of node.childNodes) {
+        if (child.nodeType === Node.TEXT_NODE || child.nodeType === Node.CDATA_SECTION_NODE) {
+            text += child.nodeValue.trim();
+        } else if (child.nodeType === Node.ELEMENT_NODE && !SKIPPED_TAGS.has(child.localName)) {
+            text += textOf(child);
+        }
+    }
+    return text;
+};
+return Array.from(document.querySelectorAll(containerSelector)).map(el => {
+    const row = {};
+    for (const [name, [selector, attribute]] of Object.entries(fields)) {
+        const target = selector ? el.querySelector(selector) : el;
+        if (!target) {
+            row[name] = null;
+        } else if (attribute) {
+            row[name] = target.getAttribute(attribute);
+        } else {
+            row[name] = textOf(target);
+        }
+    }
+    return row;
+});
+"""
+
 
 class SeleniumController:
     """Selenium浏览器控制器"""
@@ -54,6 +97,10 @@ class SeleniumController:
             options.add_argument("--disable-gpu")
             options.add_argument("--window-size=1920,1080")
             options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+            options.add_experimental_option("prefs", BLOCKED_CONTENT_PREFS)
+            
+            # DOMContentLoaded 后即返回，不等待全部子资源
+            options.page_load_strategy = "eager"
             
             self.driver = uc.Chrome(options=options)
             self.driver.set_page_load_timeout(60)
@@ -84,31 +131,92 @@ class SeleniumController:
             logger.info(f"正在访问: {url}")
             self.driver.get(url)
             
-            if wait_for_element:
-                logger.info(f"等待元素出现: {wait_for_element}")
-                WebDriverWait(self.driver, wait_timeout).until(
-                    EC.presence_of_element_located(wait_for_element)
-                )
-            else:
-                # 默认等待页面加载
-                time.sleep(5)
+            try:
+                if wait_for_element:
+                    logger.info(f"等待元素出现: {wait_for_element}")
+                    WebDriverWait(self.driver, wait_timeout).until(
+                        EC.presence_of_element_located(wait_for_element)
+                    )
+                else:
+                    # 默认等待DOM解析完成，完成即返回
+                    WebDriverWait(self.driver, wait_timeout).until(
+                        lambda driver: driver.execute_script("return document.readyState") != "loading"
+                    )
+            except TimeoutException:
+                # 超时后仍返回当前已加载的内容
+                logger.error(f"等待 {wait_for_element or '页面加载'} 超时")
             
             return self.driver.page_source
             
-        except TimeoutException:
-            logger.error(f"等待元素 {wait_for_element} 超时")
-            return self.driver.page_source  # 返回当前内容
         except Exception as e:
             logger.error(f"获取页面失败: {e}")
             return ""
     
+    def get_pages(self, urls: List[str], wait_timeout: int = 20) -> Dict[str, str]:
+        """
+        在多个标签页中并行加载页面并获取内容
+        
+        先为每个URL打开一个新标签页，让浏览器同时发起请求，
+        再逐个切换标签页收集页面内容并关闭。
+        
+        Args:
+            urls: 目标URL列表
+            wait_timeout: 每个页面的等待超时时间
+            
+        Returns:
+            Dict[str, str]: URL -> 页面HTML内容，获取失败的URL不包含在内
+        """
+        if not self.driver:
+            self.setup_driver()
+        
+        pages = {}
+        original_handle = self.driver.current_window_handle
+        tabs = []
+        
+        try:
+            # 一次性打开所有标签页，页面加载在浏览器内并行进行
+            for url in urls:
+                known_handles = set(self.driver.window_handles)
+                self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+                new_handles = [h for h in self.driver.window_handles if h not in known_handles]
+                if new_handles:
+                    tabs.append((url, new_handles[0]))
+                else:
+                    logger.warning(f"打开标签页失败: {url}")
+            
+            for url, handle in tabs:
+                self.driver.switch_to.window(handle)
+                try:
+                    WebDriverWait(self.driver, wait_timeout).until(
+                        lambda driver: driver.execute_script("return document.readyState") != "loading"
+                    )
+                except TimeoutException:
+                    logger.error(f"等待页面加载超时: {url}")
+                pages[url] = self.driver.page_source
+                
+        except Exception as e:
+            logger.error(f"批量获取页面失败: {e}")
+        finally:
+            for _, handle in tabs:
+                try:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                except WebDriverException:
+                    pass
+            try:
+                self.driver.switch_to.window(original_handle)
+            except WebDriverException:
+                pass
+        
+        return pages
+    
     def scroll_page(self, times: int = 3, pause: float = 2.0):
         """
         滚动页面
         
         Args:
             times: 滚动次数
-            pause: 每次滚动后的暂停时间
+            pause: 每次滚动后等待懒加载内容的最长时间，页面高度稳定后提前继续
         """
         if not self.driver:
             logger.error("WebDriver未初始化")
@@ -118,11 +226,36 @@ class SeleniumController:
             for i in range(times):
                 self.driver.execute_script("window.scrollBy(0, window.innerHeight);")
                 logger.info(f"第 {i+1}/{times} 次滚动完成")
-                time.sleep(pause)
+                self.wait_for_content_settle(pause)
                 
         except Exception as e:
             logger.error(f"滚动页面失败: {e}")
     
+    def wait_for_content_settle(self, timeout: float, interval: float = 0.2, stable_checks: int = 3):
+        """
+        等待页面高度连续多次轮询不再变化（懒加载内容已插入）
+        
+        Args:
+            timeout: 最长等待时间（秒）
+            interval: 轮询间隔（秒）
+            stable_checks: 判定稳定所需的连续无变化次数
+        """
+        if not self.driver:
+            return
+        
+        deadline = time.monotonic() + timeout
+        last_height = self.driver.execute_script("return document.body.scrollHeight")
+        stable = 0
+        
+        while stable < stable_checks and time.monotonic() < deadline:
+            time.sleep(interval)
+            height = self.driver.execute_script("return document.body.scrollHeight")
+            if height == last_height:
+                stable += 1
+            else:
+                stable = 0
+                last_height = height
+    
     def execute_script(self, script: str):
         """
         执行JavaScript脚本
@@ -143,6 +276,37 @@ class SeleniumController:
             logger.error(f"执行JavaScript失败: {e}")
             return None
     
+    def extract_elements(self, container_selector: str,
+                         fields: Dict[str, tuple]) -> Optional[List[Dict[str, Optional[str]]]]:
+        """
+        在浏览器内一次性提取所有容器的字段值
+        
+        只执行一次JavaScript并返回结构化结果，避免传输整个page_source
+        以及逐个元素访问带来的多次WebDriver往返。
+        
+        Args:
+            container_selector: 数据容器的CSS选择器
+            fields: 字段名 -> (CSS选择器, 属性名)，选择器为空表示容器本身，
+                    属性名为空表示取文本内容
+            
+        Returns:
+            Optional[List[Dict[str, Optional[str]]]]: 每个容器对应一条记录；脚本执行失败
+            （如浏览器不支持的选择器）时返回None，调用方可改用page_source解析
+        """
+        if not self.driver:
+            logger.error("WebDriver未初始化")
+            return None
+        
+        try:
+            return self.driver.execute_script(
+                EXTRACT_ELEMENTS_SCRIPT,
+                container_selector,
+                {name: list(spec) for name, spec in fields.items()}
+            ) or []
+        except Exception as e:
+            logger.warning(f"浏览器内提取页面元素失败: {e}")
+            return None
+    
     def find_elements(self, by: By, value: str) -> List:
         """
         查找页面元素
@@ -192,6 +356,21 @@ class SeleniumController:
             logger.error(f"等待元素失败: {e}")
             return None
     
+    def refresh(self):
+        """
+        重置浏览器状态以便复用，代替重启浏览器
+        
+        清除Cookie并导航到空白页，释放上一个页面占用的资源。
+        """
+        if not self.driver:
+            return
+        
+        try:
+            self.driver.delete_all_cookies()
+            self.driver.get("about:blank")
+        except WebDriverException as e:
+            logger.warning(f"重置浏览器状态失败: {e}")
+    
     def close(self):
         """关闭浏览器"""
         if self.driver:
@@ -204,6 +383,115 @@ class SeleniumController:
                 self.driver = None
 
 
+class SeleniumControllerPool:
+    """Selenium控制器池，复用已启动的浏览器，避免每次爬取都重新启动Chrome"""
+    
+    # 单个浏览器实例的最大使用次数，超过后重建以防内存泄漏
+    MAX_USES_PER_INSTANCE = 50
+    
+    def __init__(self, size: int = 2, headless: bool = True):
+        """
+        初始化控制器池
+        
+        Args:
+            size: 最多同时存在的浏览器实例数
+            headless: 是否无头模式
+        """
+        self.size = size
+        self.headless = headless
+        self._idle: queue.Queue = queue.Queue()
+        self._uses: Dict[int, int] = {}
+        self._created = 0
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def acquire(self) -> Iterator[SeleniumController]:
+        """
+        借出一个控制器，使用完毕后自动归还
+        
+        Yields:
+            SeleniumController: 已初始化驱动的控制器
+        """
+        controller = self._checkout()
+        try:
+            yield controller
+        finally:
+            self._checkin(controller)
+    
+    def _checkout(self) -> SeleniumController:
+        """取出空闲控制器，不足时新建，达到上限时等待归还"""
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            
+            if can_create:
+                break
+            
+            # 等待归还；被回收的实例不会放回队列，因此超时后重新检查是否可以新建
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+        
+        controller = SeleniumController(headless=self.headless)
+        try:
+            controller.setup_driver()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        return controller
+    
+    def _checkin(self, controller: SeleniumController):
+        """归还控制器，达到最大使用次数或驱动已失效时关闭"""
+        uses = self._uses.pop(id(controller), 0) + 1
+        
+        if controller.driver is None or uses >= self.MAX_USES_PER_INSTANCE:
+            controller.close()
+            with self._lock:
+                self._created -= 1
+            return
+        
+        controller.refresh()
+        self._uses[id(controller)] = uses
+        self._idle.put(controller)
+    
+    def close(self):
+        """关闭池中所有空闲的浏览器"""
+        while True:
+            try:
+                controller = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._uses.pop(id(controller), None)
+            controller.close()
+            with self._lock:
+                self._created -= 1
+
+
+@lru_cache(maxsize=1)
+def get_shared_pool() -> SeleniumControllerPool:
+    """
+    获取进程内共享的控制器池
+    
+    多次爬取（如定时任务重复运行分析）复用同一批已启动的浏览器，
+    进程退出时统一关闭。
+    
+    Returns:
+        SeleniumControllerPool: 共享的控制器池
+    """
+    pool = SeleniumControllerPool(headless=True)
+    atexit.register(pool.close)
+    return pool
+
+
 def scrape_with_selenium(url: str, 
                         wait_for_element: Optional[tuple] = None,
                         scroll_times: int = 3,
@@ -229,7 +517,7 @@ def scrape_with_selenium(url: str,
         # 滚动页面
         if scroll_times > 0:
             controller.scroll_page(scroll_times)
-            time.sleep(3)  # 等待内容加载
+            controller.wait_for_content_settle(3)  # 等待内容加载
             html_content = controller.driver.page_source
         
         return html_content
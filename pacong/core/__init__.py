@@ -7,6 +7,7 @@ from .config import Config, get_config, init_config
 from .logger import get_logger, init_logging
 from .exceptions import ScrapingError, DataProcessingError, ConfigurationError
 from .base_scraper import BaseScraper, WebScrapingMixin, BrowserScrapingMixin
+from .cache import FileCache
 
 __all__ = [
     'Config',
@@ -19,5 +20,6 @@ __all__ = [
     'ConfigurationError',
     'BaseScraper',
     'WebScrapingMixin',
-    'BrowserScrapingMixin'
+    'BrowserScrapingMixin',
+    'FileCache'
 ] 
\ No newline at end of file
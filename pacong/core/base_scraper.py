@@ -3,10 +3,13 @@
 定义所有爬虫的通用接口和行为
 """
 
+import atexit
 import requests
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 from datetime import datetime
 from pathlib import Path
 
@@ -14,6 +17,27 @@ from .config import get_config
 from .logger import get_logger, log_execution_time
 from .exceptions import ScrapingError, ConfigurationError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# 进程内共享的HTTP会话，按(爬虫名称, 重试次数)区分；重复运行同一爬虫时复用已建立的keep-alive连接
+_shared_sessions: Dict[Tuple[str, int], requests.Session] = {}
+_shared_sessions_lock = threading.Lock()
+
+
+def _close_shared_sessions():
+    """关闭所有共享HTTP会话"""
+    with _shared_sessions_lock:
+        for session in _shared_sessions.values():
+            session.close()
+        _shared_sessions.clear()
+
+
+atexit.register(_close_shared_sessions)
+
 
 class BaseScraper(ABC):
     """基础爬虫抽象类"""
@@ -31,6 +55,8 @@ class BaseScraper(ABC):
         self.request_timeout = kwargs.get('timeout', self.config.scraping.request_timeout)
         self.retry_attempts = kwargs.get('retry_attempts', self.config.scraping.retry_attempts)
         self.rate_limit_delay = kwargs.get('rate_limit_delay', self.config.scraping.rate_limit_delay)
+        # 多个数据源是否并发抓取（共享同一连接池会话，不再逐个sleep）
+        self.concurrent_sources = kwargs.get('concurrent_sources', False)
         
         # 状态跟踪
         self._start_time: Optional[datetime] = None
@@ -86,7 +112,8 @@ class BaseScraper(ABC):
         """
         # 默认实现：添加时间戳和数据源
         cleaned_data = data.copy()
-        cleaned_data.setdefault('timestamp', datetime.now())
+        if 'timestamp' not in cleaned_data:
+            cleaned_data['timestamp'] = datetime.now()
         cleaned_data.setdefault('source', self.name)
         return cleaned_data
     
@@ -109,17 +136,13 @@ class BaseScraper(ABC):
         
         self.logger.info(f"📋 发现 {len(data_sources)} 个数据源")
         
-        for i, source in enumerate(data_sources, 1):
+        for i, source, source_data, error in self._fetch_sources(data_sources):
+            if error is not None:
+                self._error_count += 1
+                self.logger.error(f"❌ 爬取失败: {source.get('name')} - {error}")
+                continue
+            
             try:
-                self.logger.info(f"🔍 [{i}/{len(data_sources)}] 爬取: {source.get('name', source.get('url'))}")
-                
-                # 速率限制
-                if i > 1:
-                    import time
-                    time.sleep(self.rate_limit_delay)
-                
-                source_data = self.scrape_single_source(source)
-                
                 if source_data:
                     # 数据验证和清洗
                     valid_data = []
@@ -133,7 +156,7 @@ class BaseScraper(ABC):
                     all_data.extend(valid_data)
                     self._scraped_count += len(valid_data)
                     
-                    self.logger.info(f"✅ 获取 {len(valid_data)} 条有效数据")
+                    self.logger.info(f"✅ [{i}/{len(data_sources)}] 获取 {len(valid_data)} 条有效数据")
                 else:
                     self.logger.warning(f"⚠️ 数据源无数据: {source.get('name')}")
                     
@@ -149,6 +172,51 @@ class BaseScraper(ABC):
         
         return all_data
     
+    def _fetch_sources(self, data_sources: List[Dict[str, Any]]):
+        """
+        抓取所有数据源的原始数据
+        
+        开启concurrent_sources时用线程池并发调用scrape_single_source，各数据源的
+        开始时间仍按rate_limit_delay错开；否则按顺序抓取并在数据源之间执行速率限制。
+        结果始终按数据源顺序产出。
+        
+        Args:
+            data_sources: 数据源列表
+            
+        Returns:
+            Iterator[Tuple]: (序号, 数据源, 数据, 异常)
+        """
+        total = len(data_sources)
+        concurrent = self.concurrent_sources and total > 1
+        started_at = time.monotonic()
+        
+        def fetch(indexed_source):
+            i, source = indexed_source
+            if concurrent:
+                # 速率限制：第i个数据源不早于开始后(i-1)*rate_limit_delay秒发起
+                wait = started_at + (i - 1) * self.rate_limit_delay - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+            self.logger.info(f"🔍 [{i}/{total}] 爬取: {source.get('name', source.get('url'))}")
+            try:
+                return i, source, self.scrape_single_source(source), None
+            except Exception as e:
+                return i, source, None, e
+        
+        indexed_sources = list(enumerate(data_sources, 1))
+        
+        if concurrent:
+            max_workers = min(total, self.config.scraping.max_concurrent_requests)
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{self.name}-fetch") as executor:
+                yield from executor.map(fetch, indexed_sources)
+            return
+        
+        for indexed_source in indexed_sources:
+            # 速率限制
+            if indexed_source[0] > 1:
+                time.sleep(self.rate_limit_delay)
+            yield fetch(indexed_source)
+    
     def get_statistics(self) -> Dict[str, Any]:
         """获取爬取统计信息"""
         return {
@@ -171,8 +239,16 @@ class BaseScraper(ABC):
         
         filepath = self.output_dir / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+        if orjson:
+            # 日期时间交给default=str，与标准库输出格式保持一致
+            filepath.write_bytes(orjson.dumps(
+                data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME,
+                default=str
+            ))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
         
         self.logger.info(f"💾 原始数据已保存: {filepath}")
         return filepath
@@ -191,32 +267,53 @@ class WebScrapingMixin:
     """网页爬虫混入类"""
     
     def setup_http_session(self):
-        """设置HTTP会话"""
-        import requests
+        """设置HTTP会话（同名爬虫共享同一会话及其连接池）"""
+        key = (self.name, self.retry_attempts)
+        with _shared_sessions_lock:
+            session = _shared_sessions.get(key)
+            if session is None:
+                session = self._create_http_session()
+                _shared_sessions[key] = session
+        self.session = session
+    
+    def _create_http_session(self) -> requests.Session:
+        """创建带重试和连接池的HTTP会话"""
         from requests.adapters import HTTPAdapter
         from urllib3.util.retry import Retry
         
-        self.session = requests.Session()
+        session = requests.Session()
         
-        # 重试策略
-        retry_strategy = Retry(
+        # 重试策略：指数退避（基数取配置的retry_delay）并加随机抖动，
+        # 避免多个并发请求在同一时刻重试；429/503时优先遵循Retry-After
+        retry_kwargs = dict(
             total=self.retry_attempts,
-            backoff_factor=1,
+            backoff_factor=self.config.scraping.retry_delay,
             status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
         )
+        try:
+            retry_strategy = Retry(**retry_kwargs, backoff_jitter=self.config.scraping.retry_delay / 2, backoff_max=30)
+        except TypeError:
+            # urllib3 1.x 不支持抖动参数
+            retry_strategy = Retry(**retry_kwargs)
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=4,
+            pool_maxsize=self.config.scraping.max_concurrent_requests,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
         
         # 默认头部
-        self.session.headers.update({
+        session.headers.update({
             'User-Agent': self.config.browser.user_agent,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
             'Accept-Encoding': 'gzip, deflate, br',
             'Connection': 'keep-alive',
         })
+        return session
     
     def get_page(self, url: str, **kwargs) -> requests.Response:
         """获取网页内容"""
@@ -224,16 +321,17 @@ class WebScrapingMixin:
             self.setup_http_session()
         
         try:
-            response = self.session.get(url, timeout=self.request_timeout, **kwargs)
+            kwargs.setdefault('timeout', self.request_timeout)
+            response = self.session.get(url, **kwargs)
             response.raise_for_status()
             return response
         except requests.RequestException as e:
             raise ScrapingError(f"请求失败: {url}", url=url) from e
     
     def cleanup(self):
-        """清理HTTP会话"""
+        """释放HTTP会话引用；共享会话保持连接以便下次复用，进程退出时统一关闭"""
         if hasattr(self, 'session'):
-            self.session.close()
+            del self.session
 
 
 class BrowserScrapingMixin:
@@ -260,6 +358,7 @@ class BrowserScrapingMixin:
         try:
             import undetected_chromedriver as uc
             from selenium.webdriver.chrome.options import Options
+            from ..browser.selenium_controller import BLOCKED_CONTENT_PREFS
             
             options = Options()
             if self.config.get('browser.headless', True):
@@ -267,6 +366,8 @@ class BrowserScrapingMixin:
             options.add_argument("--no-sandbox")
             options.add_argument("--disable-dev-shm-usage")
             options.add_argument(f"--user-agent={self.config.browser.user_agent}")
+            options.add_experimental_option("prefs", BLOCKED_CONTENT_PREFS)
+            options.page_load_strategy = "eager"
             
             self.browser = uc.Chrome(options=options)
             self.browser.set_page_load_timeout(self.config.browser.selenium_timeout)
@@ -0,0 +1,175 @@
+"""
+文件响应缓存
+将远程下载结果按键保存在磁盘上，有效期内重复请求直接读取本地文件
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Union
+
+from .logger import get_logger
+
+
+class FileCache:
+    """基于文件修改时间的TTL磁盘缓存"""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        初始化文件缓存
+
+        Args:
+            cache_dir: 缓存目录，不存在时自动创建
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = get_logger(__name__)
+
+    def _path_for(self, key_parts: Sequence[str], suffix: str = '.bin') -> Path:
+        """根据键计算缓存文件路径"""
+        digest = hashlib.md5("|".join(key_parts).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{digest}{suffix}"
+
+    def _write_atomic(self, path: Path, chunks: Iterable[bytes]):
+        """先写临时文件再原子替换，避免并发读到半个文件"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def get_path(self, key_parts: Sequence[str], ttl_seconds: float) -> Optional[Path]:
+        """
+        获取未过期的缓存文件路径（供需要按路径读取的调用方直接打开，不读入内存）
+
+        Args:
+            key_parts: 缓存键组成部分，如(URL, 参数...)
+            ttl_seconds: 有效期（秒），<= 0 时视为无缓存
+
+        Returns:
+            Optional[Path]: 缓存文件路径，不存在或已过期时返回None
+        """
+        if ttl_seconds <= 0:
+            return None
+
+        path = self._path_for(key_parts)
+        try:
+            if time.time() - path.stat().st_mtime > ttl_seconds:
+                return None
+        except OSError:
+            return None
+        return path
+
+    def get(self, key_parts: Sequence[str], ttl_seconds: float) -> Optional[bytes]:
+        """
+        读取未过期的缓存内容
+
+        Args:
+            key_parts: 缓存键组成部分，如(URL, 参数...)
+            ttl_seconds: 有效期（秒），<= 0 时视为无缓存
+
+        Returns:
+            Optional[bytes]: 缓存内容，不存在或已过期时返回None
+        """
+        if ttl_seconds <= 0:
+            return None
+
+        path = self._path_for(key_parts)
+        try:
+            if time.time() - path.stat().st_mtime > ttl_seconds:
+                return None
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def get_stale_path(self, key_parts: Sequence[str]) -> Optional[Path]:
+        """
+        获取缓存文件路径（不检查有效期，用于过期后向服务器条件请求确认是否仍可沿用）
+
+        Args:
+            key_parts: 缓存键组成部分
+
+        Returns:
+            Optional[Path]: 缓存文件路径，不存在时返回None
+        """
+        path = self._path_for(key_parts)
+        return path if path.exists() else None
+
+    def touch(self, key_parts: Sequence[str]):
+        """
+        刷新缓存文件的修改时间，使其重新进入有效期
+
+        Args:
+            key_parts: 缓存键组成部分
+        """
+        try:
+            os.utime(self._path_for(key_parts))
+        except OSError as e:
+            self.logger.warning(f"⚠️ 刷新缓存时间失败: {e}")
+
+    def get_meta(self, key_parts: Sequence[str]) -> Dict[str, Any]:
+        """
+        读取缓存条目的附加信息（如ETag、Last-Modified）
+
+        Args:
+            key_parts: 缓存键组成部分
+
+        Returns:
+            Dict[str, Any]: 附加信息，不存在或损坏时返回空字典
+        """
+        try:
+            return json.loads(self._path_for(key_parts, '.json').read_bytes())
+        except (OSError, ValueError):
+            return {}
+
+    def set_meta(self, key_parts: Sequence[str], meta: Dict[str, Any]):
+        """
+        写入缓存条目的附加信息
+
+        Args:
+            key_parts: 缓存键组成部分
+            meta: 附加信息
+        """
+        try:
+            payload = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+            self._write_atomic(self._path_for(key_parts, '.json'), (payload,))
+        except OSError as e:
+            self.logger.warning(f"⚠️ 写入缓存信息失败: {e}")
+
+    def write_stream(self, key_parts: Sequence[str], chunks: Iterable[bytes]) -> Path:
+        """
+        分块写入缓存文件（先写临时文件再原子替换）
+
+        Args:
+            key_parts: 缓存键组成部分
+            chunks: 内容分块，如响应的iter_content()
+
+        Returns:
+            Path: 写入完成的缓存文件路径
+        """
+        path = self._path_for(key_parts)
+        self._write_atomic(path, chunks)
+        return path
+
+    def set(self, key_parts: Sequence[str], payload: bytes):
+        """
+        写入缓存内容
+
+        Args:
+            key_parts: 缓存键组成部分
+            payload: 要缓存的内容
+        """
+        try:
+            self.write_stream(key_parts, (payload,))
+        except OSError as e:
+            self.logger.warning(f"⚠️ 写入缓存失败: {e}")
\ No newline at end of file
@@ -5,7 +5,7 @@ pacong.data - 数据处理模块
 
 from .models import CommodityData, ForexData, DataPoint, ScrapingResult
 from .processor import DataProcessor
-from .validator import DataValidator
+from .validator import DataValidator, InvalidItem
 
 __all__ = [
     'CommodityData',
@@ -13,5 +13,6 @@ __all__ = [
     'DataPoint',
     'ScrapingResult',
     'DataProcessor',
-    'DataValidator'
+    'DataValidator',
+    'InvalidItem'
 ] 
\ No newline at end of file
@@ -8,6 +8,12 @@ from typing import Optional, Dict, Any, Union, List
 from datetime import datetime
 from decimal import Decimal
 import json
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 @dataclass
@@ -262,5 +268,8 @@ class ScrapingResult:
     
     def save_to_json(self, filepath: str):
         """保存为JSON文件"""
+        if orjson:
+            Path(filepath).write_bytes(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            return
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(self.to_dict(), f, indent=2, ensure_ascii=False) 
\ No newline at end of file
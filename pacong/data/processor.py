@@ -4,7 +4,7 @@
 """
 
 import re
-import pandas as pd
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 from decimal import Decimal
@@ -13,6 +13,39 @@ from ..core import get_logger
 from .models import DataPoint, CommodityData, ForexData
 
 
+# 价格/百分比字符串中需要去除的字符
+_NON_NUMERIC_RE = re.compile(r'[^\d.,-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 常见的商品符号模式
+_SYMBOL_PATTERNS = (
+    re.compile(r'([A-Z]+\d*:COM)'),  # 如 GC1:COM
+    re.compile(r'([A-Z]+USD:CUR)'),  # 如 XAUUSD:CUR
+    re.compile(r'([A-Z]+\d+)'),      # 如 GC1
+    re.compile(r'([A-Z]{2,4})'),     # 通用符号
+)
+
+# 商品名称标准化映射（键为casefold后的名称，只读）
+COMMODITY_NAME_MAPPINGS = MappingProxyType({
+    name.casefold(): standard_name for name, standard_name in {
+        'Oil (WTI)': 'WTI原油',
+        'Oil (Brent)': '布伦特原油',
+        'Natural Gas': '天然气',
+        'Natural Gas (Henry Hub)': '天然气',
+        'RBOB Gasoline': 'RBOB汽油',
+        'Heating Oil': '取暖油',
+        'Live Cattle': '活牛',
+        'Lean Hog': '瘦肉猪',
+        'Feeder Cattle': '饲料牛',
+    }.items()
+})
+
+
+def _is_nan(value: Any) -> bool:
+    """判断标量是否为NaN/NaT（它们不等于自身），代替pd.isna，模块导入时无需加载pandas"""
+    return value != value
+
+
 class DataProcessor:
     """数据处理器"""
     
@@ -29,7 +62,7 @@ class DataProcessor:
         Returns:
             Optional[float]: 清洗后的价格，如果无法解析则返回None
         """
-        if not price_str or pd.isna(price_str):
+        if not price_str or _is_nan(price_str):
             return None
         
         # 转换为字符串并去除空白
@@ -40,7 +73,7 @@ class DataProcessor:
         
         try:
             # 移除货币符号和单位
-            price_str = re.sub(r'[^\d.,-]', '', price_str)
+            price_str = _NON_NUMERIC_RE.sub('', price_str)
             
             # 处理千分位逗号
             if ',' in price_str and '.' in price_str:
@@ -82,7 +115,7 @@ class DataProcessor:
         Returns:
             Optional[float]: 清洗后的百分比数值
         """
-        if not percent_str or pd.isna(percent_str):
+        if not percent_str or _is_nan(percent_str):
             return None
         
         # 转换为字符串并去除空白
@@ -93,7 +126,7 @@ class DataProcessor:
         
         try:
             # 移除百分号和其他符号，保留数字、小数点和负号
-            percent_str = re.sub(r'[^\d.,-]', '', percent_str)
+            percent_str = _NON_NUMERIC_RE.sub('', percent_str)
             
             # 处理逗号
             percent_str = percent_str.replace(',', '.')
@@ -124,16 +157,8 @@ class DataProcessor:
         if not text:
             return ""
         
-        # 常见的商品符号模式
-        symbol_patterns = [
-            r'([A-Z]+\d*:COM)',  # 如 GC1:COM
-            r'([A-Z]+USD:CUR)',  # 如 XAUUSD:CUR
-            r'([A-Z]+\d+)',      # 如 GC1
-            r'([A-Z]{2,4})',     # 通用符号
-        ]
-        
-        for pattern in symbol_patterns:
-            match = re.search(pattern, text)
+        for pattern in _SYMBOL_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1)
         
@@ -153,22 +178,9 @@ class DataProcessor:
             return ""
         
         # 去除多余空白
-        name = re.sub(r'\s+', ' ', name.strip())
-        
-        # 标准化映射
-        name_mappings = {
-            'Oil (WTI)': 'WTI原油',
-            'Oil (Brent)': '布伦特原油',
-            'Natural Gas': '天然气',
-            'Natural Gas (Henry Hub)': '天然气',
-            'RBOB Gasoline': 'RBOB汽油',
-            'Heating Oil': '取暖油',
-            'Live Cattle': '活牛',
-            'Lean Hog': '瘦肉猪',
-            'Feeder Cattle': '饲料牛',
-        }
+        name = _WHITESPACE_RE.sub(' ', name.strip())
         
-        return name_mappings.get(name, name)
+        return COMMODITY_NAME_MAPPINGS.get(name.casefold(), name)
     
     def categorize_commodity(self, name: str, symbol: str = "") -> str:
         """
@@ -225,13 +237,15 @@ class DataProcessor:
             List: 处理后的数据对象列表
         """
         processed_data = []
+        # 同一批数据共用一个默认时间戳
+        now = datetime.now()
         
         for item in raw_data:
             try:
                 if data_type == "commodity":
-                    processed_item = self._process_commodity_item(item)
+                    processed_item = self._process_commodity_item(item, now)
                 elif data_type == "forex":
-                    processed_item = self._process_forex_item(item)
+                    processed_item = self._process_forex_item(item, now)
                 else:
                     self.logger.warning(f"未知数据类型: {data_type}")
                     continue
@@ -246,7 +260,8 @@ class DataProcessor:
         self.logger.info(f"成功处理 {len(processed_data)}/{len(raw_data)} 条数据")
         return processed_data
     
-    def _process_commodity_item(self, item: Dict[str, Any]) -> Optional[CommodityData]:
+    def _process_commodity_item(self, item: Dict[str, Any],
+                                default_timestamp: Optional[datetime] = None) -> Optional[CommodityData]:
         """处理单个商品数据项"""
         try:
             # 提取基本信息
@@ -262,6 +277,12 @@ class DataProcessor:
             # 处理变化信息
             change_amount = None
             change_percent = item.get('change_percent')  # 优先使用原始数据中的change_percent
+            if change_percent is not None:
+                # 统一转为float：数字字符串（如JSON/配置爬虫给出的"1.25"）不再原样透传
+                try:
+                    change_percent = float(change_percent)
+                except (TypeError, ValueError):
+                    change_percent = self.clean_percentage_string(change_percent)
             
             change_str = item.get('change', '')
             if change_str:
@@ -275,7 +296,7 @@ class DataProcessor:
             commodity_data = CommodityData(
                 name=name,
                 value=current_price,
-                timestamp=item.get('timestamp', datetime.now()),
+                timestamp=item.get('timestamp', default_timestamp or datetime.now()),
                 source=item.get('source', ''),
                 metadata=item.get('metadata', {}),
                 symbol=symbol,
@@ -293,7 +314,8 @@ class DataProcessor:
             self.logger.error(f"处理商品数据失败: {e}")
             return None
     
-    def _process_forex_item(self, item: Dict[str, Any]) -> Optional[ForexData]:
+    def _process_forex_item(self, item: Dict[str, Any],
+                            default_timestamp: Optional[datetime] = None) -> Optional[ForexData]:
         """处理单个外汇数据项"""
         try:
             # 提取货币对信息
@@ -315,7 +337,7 @@ class DataProcessor:
             forex_data = ForexData(
                 name=pair,
                 value=current_price,
-                timestamp=item.get('timestamp', datetime.now()),
+                timestamp=item.get('timestamp', default_timestamp or datetime.now()),
                 source=item.get('source', ''),
                 metadata=item.get('metadata', {}),
                 base_currency=base_currency.strip(),
@@ -356,9 +378,7 @@ class DataProcessor:
             else:
                 key = (data_item.name, data_item.source)
             
-            if key not in data_groups:
-                data_groups[key] = []
-            data_groups[key].append(data_item)
+            data_groups.setdefault(key, []).append(data_item)
         
         # 合并每组数据
         merged_data = []
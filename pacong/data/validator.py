@@ -3,8 +3,14 @@
 提供数据有效性验证功能
 """
 
+import os
 import re
-from typing import List, Dict, Any, Optional, Union, Tuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Union, Tuple, Callable
 from datetime import datetime, timedelta
 from decimal import Decimal
 
@@ -12,14 +18,122 @@ from ..core import get_logger
 from .models import DataPoint, CommodityData, ForexData
 
 
+class ErrorCode(IntEnum):
+    """验证错误码"""
+    NOT_NULL = 1
+    NOT_NUMERIC = 2
+    OUT_OF_RANGE = 3
+    PATTERN_MISMATCH = 4
+    INVALID_TIMESTAMP = 5
+    STALE_TIMESTAMP = 6
+    FUTURE_TIMESTAMP = 7
+    PRICE_INCONSISTENT = 8
+    HIGH_BELOW_LOW = 9
+    ABOVE_HIGH = 10
+    BELOW_LOW = 11
+    CHANGE_TOO_LARGE = 12
+    BID_ABOVE_ASK = 13
+    SPREAD_TOO_LARGE = 14
+    MID_PRICE_MISMATCH = 15
+    VALIDATION_EXCEPTION = 16
+
+
+# 单条错误: (字段名, 错误码, 错误信息)，业务逻辑错误的字段名为 None
+FieldError = Tuple[Optional[str], int, str]
+
+# 商品字段规则阈值（规则表与快速验证路径共用）
+COMMODITY_PRICE_MIN = 0
+COMMODITY_PRICE_MAX = 1000000
+COMMODITY_CHANGE_MIN = -100
+COMMODITY_CHANGE_MAX = 1000
+COMMODITY_MAX_AGE_HOURS = 48
+
+
+@lru_cache(maxsize=65536)
+def _parse_iso_timestamp(value: str) -> datetime:
+    """解析 ISO 格式时间戳（按字符串缓存，批量数据中的重复时间戳只解析一次）"""
+    return datetime.fromisoformat(value)
+
+
+# 业务逻辑规则: (条件表达式, 错误码, 错误信息模板)，表达式与模板中直接使用字段名
+COMMODITY_BUSINESS_RULES = (
+    # 价格一致性检查
+    ("current_price and value and (current_price - value if current_price >= value else value - current_price) > 0.001",
+     ErrorCode.PRICE_INCONSISTENT, "当前价格与主值不一致: {current_price} vs {value}"),
+    # 价格范围检查
+    ("high_price and low_price and high_price < low_price",
+     ErrorCode.HIGH_BELOW_LOW, "最高价不能低于最低价: {high_price} < {low_price}"),
+    ("current_price and high_price and current_price > high_price",
+     ErrorCode.ABOVE_HIGH, "当前价格超过最高价: {current_price} > {high_price}"),
+    ("current_price and low_price and current_price < low_price",
+     ErrorCode.BELOW_LOW, "当前价格低于最低价: {current_price} < {low_price}"),
+    # 变化幅度合理性检查
+    ("change_percent and (change_percent > 50 or change_percent < -50)",
+     ErrorCode.CHANGE_TOO_LARGE, "变化幅度过大: {change_percent}%"),
+)
+
+FOREX_BUSINESS_RULES = (
+    # 买卖价格检查
+    ("bid_price and ask_price and bid_price > ask_price",
+     ErrorCode.BID_ABOVE_ASK, "买入价不能高于卖出价: {bid_price} > {ask_price}"),
+    # 点差不应超过买入价的10%
+    ("bid_price and ask_price and ask_price - bid_price > bid_price * 0.1",
+     ErrorCode.SPREAD_TOO_LARGE, "点差过大: {ask_price - bid_price}"),
+    # 中间价检查
+    ("mid_price and bid_price and ask_price and abs(mid_price - (bid_price + ask_price) / 2) > 0.0001",
+     ErrorCode.MID_PRICE_MISMATCH, "中间价计算错误: {mid_price} vs {(bid_price + ask_price) / 2}"),
+)
+
+
+def _build_business_checker(name: str, fields: Tuple[str, ...], rules: Tuple[Tuple[str, int, str], ...]) -> Callable[[Any], List[FieldError]]:
+    """
+    根据业务逻辑规则生成专用的验证函数
+    
+    生成的函数只读取一次所需字段，并将所有条件内联为顺序的 if 语句。
+    
+    Args:
+        name: 生成函数的名称
+        fields: 规则中用到的字段名
+        rules: 业务逻辑规则
+        
+    Returns:
+        Callable: 接收数据对象、返回错误列表的函数
+    """
+    lines = [f"def {name}(data):"]
+    lines.extend(f"    {field} = data.{field}" for field in fields)
+    lines.append("    errors = []")
+    for condition, code, message in rules:
+        lines.append(f"    if {condition}:")
+        lines.append(f"        errors.append((None, ErrorCode.{ErrorCode(code).name}, f{message!r}))")
+    lines.append("    return errors")
+    
+    namespace: Dict[str, Any] = {'ErrorCode': ErrorCode}
+    exec(compile("\n".join(lines), f"<{name}>", "exec"), namespace)
+    return namespace[name]
+
+
+@dataclass(slots=True)
+class InvalidItem:
+    """无效数据信息"""
+    index: int
+    data: Any
+    errors: Tuple[str, ...]
+    codes: Tuple[int, ...]
+
+
 class ValidationRule:
     """验证规则基类"""
     
+    __slots__ = ('name', 'description')
+    
+    # 相对执行开销，同一字段的规则按此升序执行
+    cost = 0
+    
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
     
-    def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
+    def validate(self, value: Any) -> Tuple[bool, Optional[str], Optional[int]]:
         """
         验证值
         
@@ -27,7 +141,7 @@ class ValidationRule:
             value: 待验证的值
             
         Returns:
-            Tuple[bool, Optional[str]]: (是否有效, 错误信息)
+            Tuple[bool, Optional[str], Optional[int]]: (是否有效, 错误信息, 错误码)
         """
         raise NotImplementedError
 
@@ -35,82 +149,113 @@ class ValidationRule:
 class NotNullRule(ValidationRule):
     """非空验证规则"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__("not_null", "值不能为空")
     
-    def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
+    def validate(self, value: Any) -> Tuple[bool, Optional[str], Optional[int]]:
         if value is None or value == "":
-            return False, f"{self.description}"
-        return True, None
+            return False, f"{self.description}", ErrorCode.NOT_NULL
+        return True, None, None
 
 
 class NumericRangeRule(ValidationRule):
     """数值范围验证规则"""
     
+    __slots__ = ('min_val', 'max_val')
+    cost = 1
+    
     def __init__(self, min_val: Optional[float] = None, max_val: Optional[float] = None):
         self.min_val = min_val
         self.max_val = max_val
         super().__init__("numeric_range", f"数值范围验证 [{min_val}, {max_val}]")
     
-    def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
+    def validate(self, value: Any) -> Tuple[bool, Optional[str], Optional[int]]:
         try:
             num_val = float(value)
             
             if self.min_val is not None and num_val < self.min_val:
-                return False, f"值 {num_val} 小于最小值 {self.min_val}"
+                return False, f"值 {num_val} 小于最小值 {self.min_val}", ErrorCode.OUT_OF_RANGE
             
             if self.max_val is not None and num_val > self.max_val:
-                return False, f"值 {num_val} 大于最大值 {self.max_val}"
+                return False, f"值 {num_val} 大于最大值 {self.max_val}", ErrorCode.OUT_OF_RANGE
             
-            return True, None
+            return True, None, None
             
         except (ValueError, TypeError):
-            return False, f"无法转换为数值: {value}"
+            return False, f"无法转换为数值: {value}", ErrorCode.NOT_NUMERIC
 
 
 class RegexRule(ValidationRule):
     """正则表达式验证规则"""
     
+    __slots__ = ('pattern',)
+    cost = 3
+    
     def __init__(self, pattern: str, description: str):
         self.pattern = re.compile(pattern)
         super().__init__("regex", description)
     
-    def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
+    def validate(self, value: Any) -> Tuple[bool, Optional[str], Optional[int]]:
         str_val = str(value)
         if self.pattern.match(str_val):
-            return True, None
-        return False, f"值 '{str_val}' 不匹配模式: {self.description}"
+            return True, None, None
+        return False, f"值 '{str_val}' 不匹配模式: {self.description}", ErrorCode.PATTERN_MISMATCH
+
+
+class CurrencyPairRule(ValidationRule):
+    """货币对格式验证规则 (例: USD/EUR)，按固定字节位置检查，等价于 ^[A-Z]{3}/[A-Z]{3}$"""
+    
+    __slots__ = ()
+    cost = 1
+    
+    def __init__(self):
+        super().__init__("currency_pair", "货币对格式 (例: USD/EUR)")
+    
+    def validate(self, value: Any) -> Tuple[bool, Optional[str], Optional[int]]:
+        str_val = str(value)
+        if len(str_val) == 7 and str_val.isascii():
+            b = str_val.encode('ascii')
+            if (b[3] == 0x2F
+                    and 0x41 <= b[0] <= 0x5A and 0x41 <= b[1] <= 0x5A and 0x41 <= b[2] <= 0x5A
+                    and 0x41 <= b[4] <= 0x5A and 0x41 <= b[5] <= 0x5A and 0x41 <= b[6] <= 0x5A):
+                return True, None, None
+        return False, f"值 '{str_val}' 不匹配模式: {self.description}", ErrorCode.PATTERN_MISMATCH
 
 
 class TimestampRule(ValidationRule):
     """时间戳验证规则"""
     
+    __slots__ = ('max_age_hours',)
+    cost = 2
+    
     def __init__(self, max_age_hours: int = 24):
         self.max_age_hours = max_age_hours
         super().__init__("timestamp", f"时间戳验证 (最大年龄: {max_age_hours}小时)")
     
-    def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
+    def validate(self, value: Any) -> Tuple[bool, Optional[str], Optional[int]]:
         try:
             if isinstance(value, str):
-                timestamp = datetime.fromisoformat(value)
+                timestamp = _parse_iso_timestamp(value)
             elif isinstance(value, datetime):
                 timestamp = value
             else:
-                return False, f"无效的时间戳类型: {type(value)}"
+                return False, f"无效的时间戳类型: {type(value)}", ErrorCode.INVALID_TIMESTAMP
             
             # 检查时间戳是否过旧
             age = datetime.now() - timestamp
             if age.total_seconds() > self.max_age_hours * 3600:
-                return False, f"时间戳过旧: {age}"
+                return False, f"时间戳过旧: {age}", ErrorCode.STALE_TIMESTAMP
             
             # 检查时间戳是否是未来时间
             if timestamp > datetime.now() + timedelta(hours=1):
-                return False, f"时间戳是未来时间: {timestamp}"
+                return False, f"时间戳是未来时间: {timestamp}", ErrorCode.FUTURE_TIMESTAMP
             
-            return True, None
+            return True, None, None
             
         except Exception as e:
-            return False, f"时间戳验证失败: {e}"
+            return False, f"时间戳验证失败: {e}", ErrorCode.INVALID_TIMESTAMP
 
 
 class DataValidator:
@@ -122,17 +267,18 @@ class DataValidator:
     
     def _setup_validation_rules(self):
         """设置验证规则"""
+        self._commodity_timestamp_rule = TimestampRule(max_age_hours=COMMODITY_MAX_AGE_HOURS)
         self.commodity_rules = {
             'name': [NotNullRule()],
-            'current_price': [NumericRangeRule(min_val=0, max_val=1000000)],  # 价格可选，但如果存在必须有效
-            'change_percent': [NumericRangeRule(min_val=-100, max_val=1000)],
-            'timestamp': [TimestampRule(max_age_hours=48)]
+            'current_price': [NumericRangeRule(min_val=COMMODITY_PRICE_MIN, max_val=COMMODITY_PRICE_MAX)],  # 价格可选，但如果存在必须有效
+            'change_percent': [NumericRangeRule(min_val=COMMODITY_CHANGE_MIN, max_val=COMMODITY_CHANGE_MAX)],
+            'timestamp': [self._commodity_timestamp_rule]
         }
         
         self.forex_rules = {
             'pair': [
                 NotNullRule(),
-                RegexRule(r'^[A-Z]{3}/[A-Z]{3}$', '货币对格式 (例: USD/EUR)')
+                CurrencyPairRule()
             ],
             'bid_price': [NumericRangeRule(min_val=0)],
             'ask_price': [NumericRangeRule(min_val=0)],
@@ -143,6 +289,23 @@ class DataValidator:
             'source': [NotNullRule()],
             'timestamp': [TimestampRule()]
         }
+        
+        # 业务逻辑验证函数按规则生成
+        self._validate_commodity_business_logic = _build_business_checker(
+            "_validate_commodity_business_logic",
+            ('current_price', 'value', 'high_price', 'low_price', 'change_percent'),
+            COMMODITY_BUSINESS_RULES
+        )
+        self._validate_forex_business_logic = _build_business_checker(
+            "_validate_forex_business_logic",
+            ('bid_price', 'ask_price', 'mid_price'),
+            FOREX_BUSINESS_RULES
+        )
+        
+        # 廉价规则优先执行，fail_fast 模式下可尽早返回
+        for rules in (self.commodity_rules, self.forex_rules, self.general_rules):
+            for field_rules in rules.values():
+                field_rules.sort(key=lambda rule: rule.cost)
     
     def validate_commodity_data(self, data: CommodityData) -> Tuple[bool, List[str]]:
         """
@@ -154,7 +317,8 @@ class DataValidator:
         Returns:
             Tuple[bool, List[str]]: (是否有效, 错误信息列表)
         """
-        return self._validate_data_with_rules(data, self.commodity_rules)
+        errors = self._validate_commodity_fast(data)
+        return len(errors) == 0, self._format_errors(errors)
     
     def validate_forex_data(self, data: ForexData) -> Tuple[bool, List[str]]:
         """
@@ -166,7 +330,8 @@ class DataValidator:
         Returns:
             Tuple[bool, List[str]]: (是否有效, 错误信息列表)
         """
-        return self._validate_data_with_rules(data, self.forex_rules)
+        is_valid, errors = self._validate_data_with_rules(data, self.forex_rules, business_logic_fn=self._validate_forex_business_logic)
+        return is_valid, self._format_errors(errors)
     
     def validate_data_point(self, data: DataPoint) -> Tuple[bool, List[str]]:
         """
@@ -178,20 +343,29 @@ class DataValidator:
         Returns:
             Tuple[bool, List[str]]: (是否有效, 错误信息列表)
         """
-        return self._validate_data_with_rules(data, self.general_rules)
+        is_valid, errors = self._validate_data_with_rules(data, self.general_rules)
+        return is_valid, self._format_errors(errors)
+    
+    @staticmethod
+    def _format_errors(errors: List[FieldError]) -> List[str]:
+        """将 (字段名, 错误码, 错误信息) 转换为错误信息字符串"""
+        return [f"{field_name}: {msg}" if field_name else msg for field_name, _, msg in errors]
     
-    def _validate_data_with_rules(self, data: Union[DataPoint, CommodityData, ForexData], rules: Dict[str, List[ValidationRule]]) -> Tuple[bool, List[str]]:
+    def _validate_data_with_rules(self, data: Union[DataPoint, CommodityData, ForexData], rules: Dict[str, List[ValidationRule]], fail_fast: bool = False,
+                                  business_logic_fn: Optional[Callable[[Any], List[FieldError]]] = None) -> Tuple[bool, List[FieldError]]:
         """
         使用规则验证数据
         
         Args:
             data: 数据对象
             rules: 验证规则字典
+            fail_fast: 是否在第一个错误处停止验证
+            business_logic_fn: 业务逻辑验证函数，为 None 时跳过业务逻辑验证
             
         Returns:
-            Tuple[bool, List[str]]: (是否有效, 错误信息列表)
+            Tuple[bool, List[FieldError]]: (是否有效, (字段名, 错误码, 错误信息) 列表)
         """
-        errors = []
+        errors: List[FieldError] = []
         
         for field_name, field_rules in rules.items():
             # 获取字段值
@@ -199,125 +373,159 @@ class DataValidator:
             
             # 应用每个规则
             for rule in field_rules:
-                is_valid, error_msg = rule.validate(field_value)
+                is_valid, error_msg, error_code = rule.validate(field_value)
                 if not is_valid:
-                    errors.append(f"{field_name}: {error_msg}")
+                    errors.append((field_name, error_code, error_msg))
+                    if fail_fast:
+                        return False, errors
         
         # 执行业务逻辑验证
-        business_errors = self._validate_business_logic(data)
-        errors.extend(business_errors)
+        if business_logic_fn is not None:
+            errors.extend(business_logic_fn(data))
         
         return len(errors) == 0, errors
     
-    def _validate_business_logic(self, data: Union[DataPoint, CommodityData, ForexData]) -> List[str]:
+    def _validate_commodity_fast(self, data: CommodityData, fail_fast: bool = False) -> List[FieldError]:
         """
-        业务逻辑验证
+        商品数据快速验证
+        
+        字段规则内联执行，结果与 commodity_rules + _validate_commodity_business_logic 一致。
         
         Args:
-            data: 数据对象
+            data: 商品数据对象
+            fail_fast: 是否在第一个错误处停止验证
             
         Returns:
-            List[str]: 错误信息列表
+            List[FieldError]: 错误列表
         """
-        errors = []
+        name = data.name
+        cur = data.current_price
+        chg = data.change_percent
+        ts = data.timestamp
+        errors: List[FieldError] = []
         
-        if isinstance(data, CommodityData):
-            errors.extend(self._validate_commodity_business_logic(data))
-        elif isinstance(data, ForexData):
-            errors.extend(self._validate_forex_business_logic(data))
+        # 字段规则
+        if name is None or name == "":
+            errors.append(('name', ErrorCode.NOT_NULL, "值不能为空"))
+            if fail_fast:
+                return errors
         
-        return errors
-    
-    def _validate_commodity_business_logic(self, data: CommodityData) -> List[str]:
-        """验证商品数据的业务逻辑"""
-        errors = []
-        
-        # 价格一致性检查
-        if data.current_price and data.value and abs(data.current_price - data.value) > 0.001:
-            errors.append(f"当前价格与主值不一致: {data.current_price} vs {data.value}")
-        
-        # 价格范围检查
-        if data.high_price and data.low_price and data.high_price < data.low_price:
-            errors.append(f"最高价不能低于最低价: {data.high_price} < {data.low_price}")
+        try:
+            num_val = float(cur)
+        except (ValueError, TypeError):
+            errors.append(('current_price', ErrorCode.NOT_NUMERIC, f"无法转换为数值: {cur}"))
+        else:
+            if num_val < COMMODITY_PRICE_MIN:
+                errors.append(('current_price', ErrorCode.OUT_OF_RANGE, f"值 {num_val} 小于最小值 {COMMODITY_PRICE_MIN}"))
+            elif num_val > COMMODITY_PRICE_MAX:
+                errors.append(('current_price', ErrorCode.OUT_OF_RANGE, f"值 {num_val} 大于最大值 {COMMODITY_PRICE_MAX}"))
         
-        if data.current_price:
-            if data.high_price and data.current_price > data.high_price:
-                errors.append(f"当前价格超过最高价: {data.current_price} > {data.high_price}")
-            if data.low_price and data.current_price < data.low_price:
-                errors.append(f"当前价格低于最低价: {data.current_price} < {data.low_price}")
+        if fail_fast and errors:
+            return errors
         
-        # 变化幅度合理性检查
-        if data.change_percent and abs(data.change_percent) > 50:
-            errors.append(f"变化幅度过大: {data.change_percent}%")
+        try:
+            num_val = float(chg)
+        except (ValueError, TypeError):
+            errors.append(('change_percent', ErrorCode.NOT_NUMERIC, f"无法转换为数值: {chg}"))
+        else:
+            if num_val < COMMODITY_CHANGE_MIN:
+                errors.append(('change_percent', ErrorCode.OUT_OF_RANGE, f"值 {num_val} 小于最小值 {COMMODITY_CHANGE_MIN}"))
+            elif num_val > COMMODITY_CHANGE_MAX:
+                errors.append(('change_percent', ErrorCode.OUT_OF_RANGE, f"值 {num_val} 大于最大值 {COMMODITY_CHANGE_MAX}"))
         
-        return errors
-    
-    def _validate_forex_business_logic(self, data: ForexData) -> List[str]:
-        """验证外汇数据的业务逻辑"""
-        errors = []
+        if fail_fast and errors:
+            return errors
         
-        # 买卖价格检查
-        if data.bid_price and data.ask_price:
-            if data.bid_price > data.ask_price:
-                errors.append(f"买入价不能高于卖出价: {data.bid_price} > {data.ask_price}")
-            
-            # 点差合理性检查
-            spread = data.ask_price - data.bid_price
-            if spread > data.bid_price * 0.1:  # 点差不应超过买入价的10%
-                errors.append(f"点差过大: {spread}")
+        is_valid, error_msg, error_code = self._commodity_timestamp_rule.validate(ts)
+        if not is_valid:
+            errors.append(('timestamp', error_code, error_msg))
+            if fail_fast:
+                return errors
         
-        # 中间价检查
-        if data.mid_price and data.bid_price and data.ask_price:
-            expected_mid = (data.bid_price + data.ask_price) / 2
-            if abs(data.mid_price - expected_mid) > 0.0001:
-                errors.append(f"中间价计算错误: {data.mid_price} vs {expected_mid}")
+        # 业务逻辑
+        errors.extend(self._validate_commodity_business_logic(data))
         
         return errors
     
-    def validate_data_list(self, data_list: List[Union[DataPoint, CommodityData, ForexData]]) -> Tuple[List[Union[DataPoint, CommodityData, ForexData]], List[Dict[str, Any]]]:
+    def validate_data_list(self, data_list: List[Union[DataPoint, CommodityData, ForexData]], fail_fast: bool = False) -> Tuple[List[Union[DataPoint, CommodityData, ForexData]], List[InvalidItem]]:
         """
         批量验证数据
         
         Args:
             data_list: 数据列表
+            fail_fast: 为 True 时每条无效数据只记录首个错误，适用于只需区分有效/无效的场景
             
         Returns:
             Tuple: (有效数据列表, 无效数据信息列表)
         """
-        valid_data = []
-        invalid_data = []
+        valid_data: List[Union[DataPoint, CommodityData, ForexData]] = []
+        invalid_data: List[InvalidItem] = []
         
         for i, data_item in enumerate(data_list):
             try:
                 if isinstance(data_item, CommodityData):
-                    is_valid, errors = self.validate_commodity_data(data_item)
+                    errors = self._validate_commodity_fast(data_item, fail_fast)
+                    is_valid = len(errors) == 0
                 elif isinstance(data_item, ForexData):
-                    is_valid, errors = self.validate_forex_data(data_item)
+                    is_valid, errors = self._validate_data_with_rules(data_item, self.forex_rules, fail_fast, self._validate_forex_business_logic)
                 else:
-                    is_valid, errors = self.validate_data_point(data_item)
+                    is_valid, errors = self._validate_data_with_rules(data_item, self.general_rules, fail_fast)
                 
                 if is_valid:
                     valid_data.append(data_item)
                 else:
-                    invalid_data.append({
-                        'index': i,
-                        'data': data_item,
-                        'errors': errors
-                    })
-                    self.logger.warning(f"数据验证失败 [索引 {i}]: {errors}")
+                    error_msgs = tuple(self._format_errors(errors))
+                    invalid_data.append(InvalidItem(i, data_item, error_msgs, tuple(code for _, code, _ in errors)))
             
             except Exception as e:
-                invalid_data.append({
-                    'index': i,
-                    'data': data_item,
-                    'errors': [f"验证异常: {e}"]
-                })
+                invalid_data.append(InvalidItem(i, data_item, (f"验证异常: {e}",), (ErrorCode.VALIDATION_EXCEPTION,)))
                 self.logger.error(f"数据验证异常 [索引 {i}]: {e}")
         
+        # 汇总输出一次，避免每条无效数据都触发一次日志处理
+        if invalid_data:
+            self.logger.warning(f"数据验证失败 {len(invalid_data)} 条, 示例索引: {[item.index for item in invalid_data[:10]]}")
+        
         self.logger.info(f"数据验证完成: 有效 {len(valid_data)}, 无效 {len(invalid_data)}")
         return valid_data, invalid_data
     
-    def get_validation_summary(self, invalid_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def validate_data_list_parallel(self, data_list: List[Union[DataPoint, CommodityData, ForexData]], workers: Optional[int] = None,
+                                    chunksize: int = 10000, fail_fast: bool = False) -> Tuple[List[Union[DataPoint, CommodityData, ForexData]], List[InvalidItem]]:
+        """
+        多进程批量验证数据
+        
+        数据按 chunksize 分块，由进程池并行验证后按原顺序合并；
+        数据量不超过一个分块或只有一个进程时直接在当前进程验证。
+        
+        Args:
+            data_list: 数据列表
+            workers: 进程数，默认为 CPU 核数
+            chunksize: 每个分块的数据条数
+            fail_fast: 同 validate_data_list
+            
+        Returns:
+            Tuple: (有效数据列表, 无效数据信息列表)
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(data_list) <= chunksize:
+            return self.validate_data_list(data_list, fail_fast)
+        
+        valid_data: List[Union[DataPoint, CommodityData, ForexData]] = []
+        invalid_data: List[InvalidItem] = []
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_validate_chunk, data_list[start:start + chunksize], start, fail_fast)
+                for start in range(0, len(data_list), chunksize)
+            ]
+            for future in futures:
+                chunk_valid, chunk_invalid = future.result()
+                valid_data.extend(chunk_valid)
+                invalid_data.extend(chunk_invalid)
+        
+        self.logger.info(f"并行数据验证完成: 有效 {len(valid_data)}, 无效 {len(invalid_data)} (进程数 {workers})")
+        return valid_data, invalid_data
+    
+    def get_validation_summary(self, invalid_data: List[InvalidItem]) -> Dict[str, Any]:
         """
         获取验证摘要
         
@@ -330,15 +538,21 @@ class DataValidator:
         if not invalid_data:
             return {"status": "all_valid", "total_errors": 0}
         
-        error_counts = {}
-        for item in invalid_data:
-            for error in item['errors']:
-                error_type = error.split(':')[0] if ':' in error else error
-                error_counts[error_type] = error_counts.get(error_type, 0) + 1
+        code_counts = Counter(code for item in invalid_data for code in item.codes)
+        error_counts = {ErrorCode(code).name: count for code, count in code_counts.items()}
         
         return {
             "status": "has_errors",
             "total_errors": len(invalid_data),
             "error_breakdown": error_counts,
             "most_common_error": max(error_counts.items(), key=lambda x: x[1]) if error_counts else None
-        } 
\ No newline at end of file
+        }
+
+
+def _validate_chunk(chunk: List[Union[DataPoint, CommodityData, ForexData]], offset: int,
+                    fail_fast: bool) -> Tuple[List[Union[DataPoint, CommodityData, ForexData]], List[InvalidItem]]:
+    """进程池工作函数：验证一个分块，并将无效数据索引换算为原列表中的索引"""
+    valid_data, invalid_data = DataValidator().validate_data_list(chunk, fail_fast)
+    for item in invalid_data:
+        item.index += offset
+    return valid_data, invalid_data
\ No newline at end of file
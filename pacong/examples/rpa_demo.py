@@ -35,8 +35,8 @@ async def demo_basic_navigation():
         if success:
             print("✅ 成功打开Google")
             
-            # 等待页面加载
-            await rpa.sleep(2)
+            # 等待页面加载（搜索框出现即返回）
+            await rpa.wait_for_element('[name="q"]', timeout=10)
             
             # 获取页面标题
             title = await rpa.execute_in_devtools("document.title")
@@ -64,9 +64,6 @@ async def demo_search_functionality():
             print("❌ 无法打开Google")
             return False
         
-        # 等待页面加载
-        await rpa.sleep(3)
-        
         # 等待搜索框出现
         search_box_exists = await rpa.wait_for_element('input[name="q"]', timeout=10)
         if not search_box_exists:
@@ -79,9 +76,6 @@ async def demo_search_functionality():
         if await rpa.click_element('input[name="q"]'):
             print("✅ 成功点击搜索框")
             
-            # 等待一下
-            await rpa.sleep(1)
-            
             # 输入搜索内容
             if await rpa.controller.type_text("Python RPA自动化测试"):
                 print("✅ 成功输入搜索内容")
@@ -91,7 +85,7 @@ async def demo_search_functionality():
                     print("✅ 成功执行搜索")
                     
                     # 等待搜索结果
-                    await rpa.sleep(3)
+                    await rpa.wait_for_element('#search', timeout=10)
                     
                     # 获取搜索结果页面标题
                     title = await rpa.execute_in_devtools("document.title")
@@ -119,7 +113,7 @@ async def demo_page_interaction():
             return False
         
         # 等待页面加载
-        await rpa.sleep(3)
+        await rpa.wait_for_element('h1', timeout=10)
         
         # 获取页面内容
         content = await rpa.get_page_content()
@@ -156,7 +150,7 @@ async def demo_devtools_execution():
             return False
         
         # 等待页面加载
-        await rpa.sleep(3)
+        await rpa.wait_for_element('h1', timeout=10)
         
         # 执行各种JavaScript代码
         test_cases = [
@@ -230,6 +224,22 @@ async def demo_error_handling():
         return False
 
 
+async def _run_demo(name, demo_func) -> bool:
+    """运行单个演示并输出结果"""
+    print(f"\n🎬 开始运行: {name}")
+    try:
+        success = await demo_func()
+    except Exception as e:
+        print(f"💥 {name} - 演示异常: {e}")
+        return False
+    
+    if success:
+        print(f"✅ {name} - 演示成功")
+    else:
+        print(f"❌ {name} - 演示失败")
+    return bool(success)
+
+
 async def main():
     """主演示函数"""
     print("🎭 跨平台RPA Chrome控制器演示")
@@ -244,23 +254,10 @@ async def main():
         ("错误处理", demo_error_handling),
     ]
     
+    # 所有演示共用同一个前台Chrome窗口（通过键盘事件控制），只能依次运行
     results = []
-    
     for name, demo_func in demos:
-        print(f"\n🎬 开始运行: {name}")
-        try:
-            success = await demo_func()
-            results.append((name, success))
-            if success:
-                print(f"✅ {name} - 演示成功")
-            else:
-                print(f"❌ {name} - 演示失败")
-        except Exception as e:
-            print(f"💥 {name} - 演示异常: {e}")
-            results.append((name, False))
-        
-        # 演示间隔
-        await asyncio.sleep(2)
+        results.append((name, await _run_demo(name, demo_func)))
     
     # 输出总结
     print("\n📊 演示结果总结")
@@ -5,6 +5,7 @@ Pacong 爬虫系统主入口
 """
 
 import argparse
+import difflib
 import sys
 from pathlib import Path
 from typing import List, Optional
@@ -14,8 +15,9 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from pacong.core import init_config, init_logging, get_logger
-from pacong.services import CommodityService
-from pacong.scrapers import ScraperFactory
+
+# 服务层和爬虫模块会连带导入pandas/bs4/lxml等重量级依赖，
+# 放到实际用到的函数内导入，--help/--version不再付出这部分启动开销
 
 
 def setup_argument_parser() -> argparse.ArgumentParser:
@@ -66,6 +68,13 @@ def setup_argument_parser() -> argparse.ArgumentParser:
         help='日志级别'
     )
     
+    parser.add_argument(
+        '--cache-ttl',
+        type=int,
+        default=0,
+        help='数据缓存有效期（秒），相同爬虫组合在有效期内复用上次结果，默认0即不缓存'
+    )
+    
     parser.add_argument(
         '--quiet', '-q',
         action='store_true',
@@ -83,11 +92,18 @@ def setup_argument_parser() -> argparse.ArgumentParser:
 
 def validate_scrapers(scraper_names: List[str]) -> List[str]:
     """验证爬虫名称"""
+    from pacong.scrapers import ScraperFactory
+    
     available_scrapers = ScraperFactory.list_available_scrapers()
-    invalid_scrapers = [name for name in scraper_names if name not in available_scrapers]
+    available_set = set(available_scrapers)
+    invalid_scrapers = [name for name in scraper_names if name not in available_set]
     
     if invalid_scrapers:
         print(f"❌ 无效的爬虫名称: {', '.join(invalid_scrapers)}")
+        for name in invalid_scrapers:
+            suggestions = difflib.get_close_matches(name, available_scrapers, n=1)
+            if suggestions:
+                print(f"💡 {name} -> 您是否想使用: {suggestions[0]}")
         print(f"📋 可用爬虫: {', '.join(available_scrapers)}")
         sys.exit(1)
     
@@ -96,6 +112,8 @@ def validate_scrapers(scraper_names: List[str]) -> List[str]:
 
 def list_scrapers():
     """列出所有可用爬虫"""
+    from pacong.scrapers import ScraperFactory
+    
     scrapers = ScraperFactory.list_available_scrapers()
     
     print("📋 可用爬虫列表:")
@@ -206,7 +224,9 @@ def main():
             logger.info(f"使用指定爬虫: {', '.join(scraper_names)}")
         
         # 创建服务并运行分析
-        commodity_service = CommodityService()
+        from pacong.services import CommodityService
+        
+        commodity_service = CommodityService(cache_ttl=args.cache_ttl)
         result = commodity_service.run_full_analysis(scraper_names)
         
         # 打印结果
@@ -4,13 +4,38 @@ CSV输出模块
 """
 
 import csv
-from typing import List, Union
+from operator import attrgetter
+from typing import Iterable, Iterator, List, Sequence, Tuple, Union
 from pathlib import Path
 
 from ..core import get_logger
 from ..data import CommodityData, ForexData
 
 
+# CSV字段（与数据对象属性同名，timestamp单独格式化）
+COMMODITY_FIELDS = (
+    'name', 'chinese_name', 'symbol', 'category', 'currency',
+    'current_price', 'change_amount', 'change_percent',
+    'open_price', 'high_price', 'low_price', 'previous_close',
+    'volume', 'market_cap', 'source', 'timestamp'
+)
+
+FOREX_FIELDS = (
+    'pair', 'base_currency', 'quote_currency',
+    'bid_price', 'ask_price', 'mid_price', 'spread',
+    'change_amount', 'change_percent',
+    'source', 'timestamp'
+)
+
+
+def _iter_rows(items: Iterable, fields: Sequence[str]) -> Iterator[Tuple]:
+    """按字段顺序逐条生成CSV行元组，最后一列timestamp转为ISO格式"""
+    get_values = attrgetter(*fields[:-1])
+    for item in items:
+        timestamp = item.timestamp
+        yield get_values(item) + (timestamp.isoformat() if timestamp else None,)
+
+
 class CSVWriter:
     """CSV文件写入器"""
     
@@ -32,42 +57,12 @@ class CSVWriter:
         filepath = Path(filepath)
         filepath.parent.mkdir(parents=True, exist_ok=True)
         
-        # 定义CSV字段
-        fieldnames = [
-            'name', 'chinese_name', 'symbol', 'category', 'currency',
-            'current_price', 'change_amount', 'change_percent',
-            'open_price', 'high_price', 'low_price', 'previous_close',
-            'volume', 'market_cap', 'source', 'timestamp'
-        ]
-        
         try:
+            # 直接写出行元组，不再为每条数据构造字典
             with open(filepath, 'w', newline='', encoding='utf-8-sig') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                # 写入表头
-                writer.writeheader()
-                
-                # 写入数据
-                for commodity in commodities:
-                    row_data = {
-                        'name': commodity.name,
-                        'chinese_name': commodity.chinese_name,
-                        'symbol': commodity.symbol,
-                        'category': commodity.category,
-                        'currency': commodity.currency,
-                        'current_price': commodity.current_price,
-                        'change_amount': commodity.change_amount,
-                        'change_percent': commodity.change_percent,
-                        'open_price': commodity.open_price,
-                        'high_price': commodity.high_price,
-                        'low_price': commodity.low_price,
-                        'previous_close': commodity.previous_close,
-                        'volume': commodity.volume,
-                        'market_cap': commodity.market_cap,
-                        'source': commodity.source,
-                        'timestamp': commodity.timestamp.isoformat() if commodity.timestamp else None
-                    }
-                    writer.writerow(row_data)
+                writer = csv.writer(csvfile)
+                writer.writerow(COMMODITY_FIELDS)
+                writer.writerows(_iter_rows(commodities, COMMODITY_FIELDS))
             
             self.logger.info(f"成功写入 {len(commodities)} 条商品数据到 {filepath}")
             
@@ -90,37 +85,11 @@ class CSVWriter:
         filepath = Path(filepath)
         filepath.parent.mkdir(parents=True, exist_ok=True)
         
-        # 定义CSV字段
-        fieldnames = [
-            'pair', 'base_currency', 'quote_currency',
-            'bid_price', 'ask_price', 'mid_price', 'spread',
-            'change_amount', 'change_percent',
-            'source', 'timestamp'
-        ]
-        
         try:
             with open(filepath, 'w', newline='', encoding='utf-8-sig') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                # 写入表头
-                writer.writeheader()
-                
-                # 写入数据
-                for forex in forex_data:
-                    row_data = {
-                        'pair': forex.pair,
-                        'base_currency': forex.base_currency,
-                        'quote_currency': forex.quote_currency,
-                        'bid_price': forex.bid_price,
-                        'ask_price': forex.ask_price,
-                        'mid_price': forex.mid_price,
-                        'spread': forex.spread,
-                        'change_amount': forex.change_amount,
-                        'change_percent': forex.change_percent,
-                        'source': forex.source,
-                        'timestamp': forex.timestamp.isoformat() if forex.timestamp else None
-                    }
-                    writer.writerow(row_data)
+                writer = csv.writer(csvfile)
+                writer.writerow(FOREX_FIELDS)
+                writer.writerows(_iter_rows(forex_data, FOREX_FIELDS))
             
             self.logger.info(f"成功写入 {len(forex_data)} 条外汇数据到 {filepath}")
             
@@ -3,14 +3,150 @@ Excel输出模块
 提供Excel格式的数据输出功能
 """
 
-from typing import List, Union, Dict, Any
+from contextlib import contextmanager
+from itertools import chain
+from typing import List, Union, Dict, Any, Iterable
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 from ..core import get_logger
 from ..data import CommodityData, ForexData
 
 
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+# 只写不读，xlsxwriter比openpyxl更快、内存占用更低；未安装时退回openpyxl的write_only流式模式。
+# 注意不能开启constant_memory：pandas按列写入单元格，该模式下会丢失已刷出行之外的数据
+if xlsxwriter:
+    EXCEL_ENGINE = 'xlsxwriter'
+    # 以'='开头的文本（如摘要表中的"=== 分类统计 ==="）按普通字符串写入，而不是公式
+    EXCEL_ENGINE_KWARGS = {'options': {'strings_to_formulas': False}}
+else:
+    EXCEL_ENGINE = 'openpyxl'
+    EXCEL_ENGINE_KWARGS = {}
+
+# 表头 -> 数据对象属性
+COMMODITY_COLUMNS = (
+    ('商品名称', 'name'),
+    ('中文名称', 'chinese_name'),
+    ('商品代码', 'symbol'),
+    ('分类', 'category'),
+    ('货币', 'currency'),
+    ('当前价格', 'current_price'),
+    ('变化金额', 'change_amount'),
+    ('变化百分比(%)', 'change_percent'),
+    ('开盘价', 'open_price'),
+    ('最高价', 'high_price'),
+    ('最低价', 'low_price'),
+    ('昨收价', 'previous_close'),
+    ('成交量', 'volume'),
+    ('市值', 'market_cap'),
+    ('数据源', 'source'),
+    ('更新时间', 'timestamp'),
+)
+
+FOREX_COLUMNS = (
+    ('货币对', 'pair'),
+    ('基础货币', 'base_currency'),
+    ('报价货币', 'quote_currency'),
+    ('买入价', 'bid_price'),
+    ('卖出价', 'ask_price'),
+    ('中间价', 'mid_price'),
+    ('点差', 'spread'),
+    ('变化金额', 'change_amount'),
+    ('变化百分比(%)', 'change_percent'),
+    ('数据源', 'source'),
+    ('更新时间', 'timestamp'),
+)
+
+
+def _build_dataframe(items: List[Any], columns: tuple) -> pd.DataFrame:
+    """按列（dict-of-lists）构建DataFrame，避免逐行创建字典再由pandas推断列"""
+    return pd.DataFrame({
+        header: [getattr(item, attr) for item in items]
+        for header, attr in columns
+    })
+
+
+class _XlsxWriterWorkbook:
+    """基于pandas + xlsxwriter的工作簿"""
+    
+    def __init__(self, filepath: Path):
+        self._writer = pd.ExcelWriter(filepath, engine='xlsxwriter', engine_kwargs=EXCEL_ENGINE_KWARGS)
+    
+    def write_frame(self, sheet_name: str, df: pd.DataFrame):
+        df.to_excel(self._writer, sheet_name=sheet_name, index=False)
+    
+    def write_rows(self, sheet_name: str, rows: Iterable[tuple]):
+        # 行数很少，直接调用底层引擎写入，省去构建DataFrame的开销
+        worksheet = self._writer.book.add_worksheet(sheet_name)
+        for row_idx, row in enumerate(rows):
+            worksheet.write_row(row_idx, 0, row)
+    
+    def close(self):
+        self._writer.close()
+
+
+class _OpenpyxlStreamingWorkbook:
+    """
+    openpyxl write_only模式的工作簿
+    
+    逐行append直接序列化，不在内存中为每个单元格保留Cell对象。
+    """
+    
+    def __init__(self, filepath: Path):
+        from openpyxl import Workbook
+        
+        self._filepath = filepath
+        self._book = Workbook(write_only=True)
+    
+    def write_frame(self, sheet_name: str, df: pd.DataFrame):
+        # NaN/NaT写为空单元格（与pandas.to_excel一致）
+        values = df.astype(object).where(df.notna(), None)
+        self.write_rows(sheet_name, chain([tuple(df.columns)], values.itertuples(index=False, name=None)))
+    
+    def write_rows(self, sheet_name: str, rows: Iterable[tuple]):
+        from openpyxl.cell import WriteOnlyCell
+        
+        worksheet = self._book.create_sheet(sheet_name)
+        for row in rows:
+            # 以'='开头的文本按字符串写入，而不是公式
+            worksheet.append([
+                self._text_cell(worksheet, value, WriteOnlyCell) if isinstance(value, str) and value.startswith('=') else value
+                for value in row
+            ])
+    
+    @staticmethod
+    def _text_cell(worksheet, value: str, cell_class):
+        cell = cell_class(worksheet, value=value)
+        cell.data_type = 's'
+        return cell
+    
+    def close(self):
+        self._book.save(self._filepath)
+
+
+@contextmanager
+def _open_workbook(filepath: Path):
+    """按当前引擎打开工作簿，退出时保存"""
+    workbook = _XlsxWriterWorkbook(filepath) if EXCEL_ENGINE == 'xlsxwriter' else _OpenpyxlStreamingWorkbook(filepath)
+    try:
+        yield workbook
+    finally:
+        workbook.close()
+
+
+def _summary_rows(summary_data: List[Dict[str, Any]]) -> List[tuple]:
+    """摘要行（'指标'/'数值'）转换为带表头的行列表"""
+    rows = [('指标', '数值')]
+    rows.extend((row['指标'], row['数值']) for row in summary_data)
+    return rows
+
+
 class ExcelWriter:
     """Excel文件写入器"""
     
@@ -34,51 +170,25 @@ class ExcelWriter:
         
         try:
             # 转换为DataFrame
-            data_list = []
-            for commodity in commodities:
-                data_list.append({
-                    '商品名称': commodity.name,
-                    '中文名称': commodity.chinese_name,
-                    '商品代码': commodity.symbol,
-                    '分类': commodity.category,
-                    '货币': commodity.currency,
-                    '当前价格': commodity.current_price,
-                    '变化金额': commodity.change_amount,
-                    '变化百分比(%)': commodity.change_percent,
-                    '开盘价': commodity.open_price,
-                    '最高价': commodity.high_price,
-                    '最低价': commodity.low_price,
-                    '昨收价': commodity.previous_close,
-                    '成交量': commodity.volume,
-                    '市值': commodity.market_cap,
-                    '数据源': commodity.source,
-                    '更新时间': commodity.timestamp
-                })
-            
-            df = pd.DataFrame(data_list)
+            df = _build_dataframe(commodities, COMMODITY_COLUMNS)
             
-            # 按分类分组数据
-            categories = df['分类'].unique() if '分类' in df.columns else []
-            
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+            with _open_workbook(filepath) as workbook:
                 # 写入总表
-                df.to_excel(writer, sheet_name='全部商品', index=False)
+                workbook.write_frame('全部商品', df)
                 
-                # 按分类创建工作表
-                for category in categories:
+                # 按分类创建工作表：整表只排序一次（分类按首次出现顺序、组内价格降序），
+                # 之后groupby拿到的每个分组已是有序的连续切片
+                category_codes = pd.factorize(df['分类'])[0]
+                prices = pd.to_numeric(df['当前价格'], errors='coerce').to_numpy(dtype=float)
+                sorted_df = df.take(np.lexsort((-prices, category_codes)))
+                for category, category_df in sorted_df.groupby('分类', sort=False):
                     if category and category != '其他':
-                        category_df = df[df['分类'] == category]
-                        if not category_df.empty:
-                            # 按价格排序
-                            if '当前价格' in category_df.columns:
-                                category_df = category_df.sort_values('当前价格', ascending=False)
-                            category_df.to_excel(writer, sheet_name=category, index=False)
+                        workbook.write_frame(category, category_df)
                 
                 # 创建摘要表
-                summary_data = self._create_commodity_summary(commodities)
+                summary_data = self._create_commodity_summary(df)
                 if summary_data:
-                    summary_df = pd.DataFrame(summary_data)
-                    summary_df.to_excel(writer, sheet_name='数据摘要', index=False)
+                    workbook.write_rows('数据摘要', _summary_rows(summary_data))
             
             self.logger.info(f"成功写入 {len(commodities)} 条商品数据到 {filepath}")
             
@@ -103,33 +213,16 @@ class ExcelWriter:
         
         try:
             # 转换为DataFrame
-            data_list = []
-            for forex in forex_data:
-                data_list.append({
-                    '货币对': forex.pair,
-                    '基础货币': forex.base_currency,
-                    '报价货币': forex.quote_currency,
-                    '买入价': forex.bid_price,
-                    '卖出价': forex.ask_price,
-                    '中间价': forex.mid_price,
-                    '点差': forex.spread,
-                    '变化金额': forex.change_amount,
-                    '变化百分比(%)': forex.change_percent,
-                    '数据源': forex.source,
-                    '更新时间': forex.timestamp
-                })
-            
-            df = pd.DataFrame(data_list)
+            df = _build_dataframe(forex_data, FOREX_COLUMNS)
             
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+            with _open_workbook(filepath) as workbook:
                 # 写入主表
-                df.to_excel(writer, sheet_name='外汇数据', index=False)
+                workbook.write_frame('外汇数据', df)
                 
                 # 创建摘要表
-                summary_data = self._create_forex_summary(forex_data)
+                summary_data = self._create_forex_summary(df)
                 if summary_data:
-                    summary_df = pd.DataFrame(summary_data)
-                    summary_df.to_excel(writer, sheet_name='数据摘要', index=False)
+                    workbook.write_rows('数据摘要', _summary_rows(summary_data))
             
             self.logger.info(f"成功写入 {len(forex_data)} 条外汇数据到 {filepath}")
             
@@ -137,56 +230,64 @@ class ExcelWriter:
             self.logger.error(f"写入Excel文件失败: {e}")
             raise
     
-    def _create_commodity_summary(self, commodities: List[CommodityData]) -> List[Dict[str, Any]]:
-        """创建商品数据摘要"""
-        if not commodities:
+    def _create_commodity_summary(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        基于已构建的商品DataFrame创建数据摘要
+        
+        Args:
+            df: write_commodity_data中构建的商品DataFrame
+            
+        Returns:
+            List[Dict[str, Any]]: 摘要行
+        """
+        if df.empty:
             return []
         
         summary = []
         
-        # 基本统计
-        total_count = len(commodities)
-        commodities_with_change = [c for c in commodities if c.change_percent is not None]
+        # 基本统计（列运算，不再逐个对象遍历）
+        changes = pd.to_numeric(df['变化百分比(%)'], errors='coerce').dropna()
         
-        summary.append({'指标': '总商品数', '数值': total_count})
-        summary.append({'指标': '有涨跌数据的商品', '数值': len(commodities_with_change)})
+        summary.append({'指标': '总商品数', '数值': len(df)})
+        summary.append({'指标': '有涨跌数据的商品', '数值': len(changes)})
         
-        if commodities_with_change:
-            avg_change = sum(c.change_percent for c in commodities_with_change) / len(commodities_with_change)
-            gainers = len([c for c in commodities_with_change if c.change_percent > 0])
-            losers = len([c for c in commodities_with_change if c.change_percent < 0])
-            
-            summary.append({'指标': '平均涨跌幅(%)', '数值': round(avg_change, 2)})
-            summary.append({'指标': '上涨商品数', '数值': gainers})
-            summary.append({'指标': '下跌商品数', '数值': losers})
+        if not changes.empty:
+            summary.append({'指标': '平均涨跌幅(%)', '数值': round(float(changes.mean()), 2)})
+            summary.append({'指标': '上涨商品数', '数值': int((changes > 0).sum())})
+            summary.append({'指标': '下跌商品数', '数值': int((changes < 0).sum())})
         
         # 分类统计
-        from collections import Counter
-        categories = Counter(c.category for c in commodities if c.category)
+        categories = df['分类'][df['分类'].fillna('') != ''].value_counts()
         
         summary.append({'指标': '', '数值': ''})  # 空行
         summary.append({'指标': '=== 分类统计 ===', '数值': ''})
         
-        for category, count in categories.most_common():
-            summary.append({'指标': f'{category}商品数', '数值': count})
+        for category, count in categories.items():
+            summary.append({'指标': f'{category}商品数', '数值': int(count)})
         
         return summary
     
-    def _create_forex_summary(self, forex_data: List[ForexData]) -> List[Dict[str, Any]]:
-        """创建外汇数据摘要"""
-        if not forex_data:
+    def _create_forex_summary(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        基于已构建的外汇DataFrame创建数据摘要
+        
+        Args:
+            df: write_forex_data中构建的外汇DataFrame
+            
+        Returns:
+            List[Dict[str, Any]]: 摘要行
+        """
+        if df.empty:
             return []
         
         summary = []
         
         # 基本统计
-        total_count = len(forex_data)
-        summary.append({'指标': '总货币对数', '数值': total_count})
+        summary.append({'指标': '总货币对数', '数值': len(df)})
         
-        # 点差统计
-        spreads = [f.spread for f in forex_data if f.spread is not None]
-        if spreads:
-            avg_spread = sum(spreads) / len(spreads)
-            summary.append({'指标': '平均点差', '数值': round(avg_spread, 4)})
+        # 点差统计（列运算）
+        spreads = pd.to_numeric(df['点差'], errors='coerce').dropna()
+        if not spreads.empty:
+            summary.append({'指标': '平均点差', '数值': round(float(spreads.mean()), 4)})
         
-        return summary 
\ No newline at end of file
+        return summary
\ No newline at end of file
@@ -4,72 +4,111 @@ Business Insider商品数据爬虫
 """
 
 import re
+from functools import lru_cache
+from io import BytesIO
+from itertools import islice
+from types import MappingProxyType
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+from lxml import etree
 
-from ..core import BaseScraper, WebScrapingMixin, get_config
+from ..core import BaseScraper, WebScrapingMixin
 from ..data import CommodityData
 
 
+# 价格（允许千分位逗号），一次匹配即可同时完成“含数字”判断和数值提取
+_PRICE_RE = re.compile(r'(\d[\d,]*\.?\d*)')
+_PERCENT_RE = re.compile(r'([+-]?\d+\.?\d*)%')
+_HEADER_RE = re.compile(r'commodity|price', re.IGNORECASE)
+
+# 商品中文翻译对照表
+COMMODITY_TRANSLATIONS = MappingProxyType({
+    # 贵金属
+    'Gold': '黄金',
+    'Silver': '白银', 
+    'Platinum': '铂金',
+    'Palladium': '钯金',
+    
+    # 能源
+    'Natural Gas': '天然气',
+    'Natural Gas (Henry Hub)': '天然气(亨利中心)',
+    'Heating Oil': '取暖油',
+    'Coal': '煤炭',
+    'RBOB Gasoline': 'RBOB汽油',
+    'Oil (Brent)': '布伦特原油',
+    'Oil (WTI)': 'WTI原油',
+    'Crude Oil': '原油',
+    
+    # 工业金属
+    'Aluminium': '铝',
+    'Aluminum': '铝',
+    'Lead': '铅',
+    'Copper': '铜',
+    'Nickel': '镍',
+    'Zinc': '锌',
+    'Tin': '锡',
+    
+    # 农产品
+    'Cotton': '棉花',
+    'Oats': '燕麦',
+    'Lumber': '木材',
+    'Coffee': '咖啡',
+    'Cocoa': '可可',
+    'Live Cattle': '活牛',
+    'Lean Hog': '瘦肉猪',
+    'Corn': '玉米',
+    'Feeder Cattle': '饲料牛',
+    'Milk': '牛奶',
+    'Orange Juice': '橙汁',
+    'Palm Oil': '棕榈油',
+    'Rapeseed': '油菜籽',
+    'Rice': '大米',
+    'Soybean Meal': '豆粕',
+    'Soybeans': '大豆',
+    'Soybean Oil': '豆油',
+    'Wheat': '小麦',
+    'Sugar': '糖',
+})
+
+# 分类关键字按优先级排列，每个分类预编译为一个正则（子串匹配，与原逐个关键字判断一致）
+_CATEGORY_KEYWORDS = (
+    # 能源类
+    ("能源", ('oil', 'gas', 'gasoline', 'heating', 'brent', 'wti', 'crude')),
+    # 贵金属
+    ("贵金属", ('gold', 'silver', 'platinum', 'palladium')),
+    # 工业金属
+    ("工业金属", ('copper', 'aluminum', 'aluminium', 'zinc', 'nickel', 'lead', 'tin')),
+    # 农产品
+    ("农产品", ('corn', 'wheat', 'soybean', 'cotton', 'sugar', 'coffee', 'cocoa',
+                'cattle', 'hog', 'lumber', 'milk', 'orange', 'palm', 'rapeseed', 'rice')),
+)
+_CATEGORY_PATTERNS = tuple(
+    (category, re.compile('|'.join(map(re.escape, keywords))))
+    for category, keywords in _CATEGORY_KEYWORDS
+)
+
+
+@lru_cache(maxsize=1024)
+def _categorize_name(name: str) -> str:
+    """按名称分类商品（同名商品在多次爬取中反复出现，结果按名称缓存）"""
+    name_lower = name.lower()
+    for category, pattern in _CATEGORY_PATTERNS:
+        if pattern.search(name_lower):
+            return category
+    return "其他"
+
+
 class BusinessInsiderScraper(BaseScraper, WebScrapingMixin):
     """Business Insider商品数据爬虫"""
     
     def __init__(self, **kwargs):
         super().__init__("business_insider", **kwargs)
         
-        # 商品中文翻译对照表
-        self.commodity_translations = {
-            # 贵金属
-            'Gold': '黄金',
-            'Silver': '白银', 
-            'Platinum': '铂金',
-            'Palladium': '钯金',
-            
-            # 能源
-            'Natural Gas': '天然气',
-            'Natural Gas (Henry Hub)': '天然气(亨利中心)',
-            'Heating Oil': '取暖油',
-            'Coal': '煤炭',
-            'RBOB Gasoline': 'RBOB汽油',
-            'Oil (Brent)': '布伦特原油',
-            'Oil (WTI)': 'WTI原油',
-            'Crude Oil': '原油',
-            
-            # 工业金属
-            'Aluminium': '铝',
-            'Aluminum': '铝',
-            'Lead': '铅',
-            'Copper': '铜',
-            'Nickel': '镍',
-            'Zinc': '锌',
-            'Tin': '锡',
-            
-            # 农产品
-            'Cotton': '棉花',
-            'Oats': '燕麦',
-            'Lumber': '木材',
-            'Coffee': '咖啡',
-            'Cocoa': '可可',
-            'Live Cattle': '活牛',
-            'Lean Hog': '瘦肉猪',
-            'Corn': '玉米',
-            'Feeder Cattle': '饲料牛',
-            'Milk': '牛奶',
-            'Orange Juice': '橙汁',
-            'Palm Oil': '棕榈油',
-            'Rapeseed': '油菜籽',
-            'Rice': '大米',
-            'Soybean Meal': '豆粕',
-            'Soybeans': '大豆',
-            'Soybean Oil': '豆油',
-            'Wheat': '小麦',
-            'Sugar': '糖',
-        }
+        # 商品中文翻译对照表（模块级只读映射，所有实例共享）
+        self.commodity_translations = COMMODITY_TRANSLATIONS
     
     def get_data_sources(self) -> List[Dict[str, str]]:
         """获取数据源列表"""
-        config = get_config()
-        bi_config = config.data_sources.get('business_insider', {})
+        bi_config = self.config.data_sources.get('business_insider', {})
         
         if not bi_config.get('enabled', True):
             return []
@@ -87,23 +126,32 @@ class BusinessInsiderScraper(BaseScraper, WebScrapingMixin):
         
         try:
             response = self.get_page(url)
-            soup = BeautifulSoup(response.content, 'html.parser')
             
             commodities = []
-            tables = soup.find_all('table')
-            
-            self.logger.info(f"发现 {len(tables)} 个数据表格")
+            table_count = 0
             
-            for table in tables:
-                rows = table.find_all('tr')
+            # 流式解析：每行结束时立即提取，处理完的顶层表格随即释放，不保留整个DOM
+            events = etree.iterparse(BytesIO(response.content), events=('end',),
+                                     tag=('table', 'tr'), html=True)
+            for _, element in events:
+                in_table = next(element.iterancestors('table'), None) is not None
+                
+                if element.tag == 'table':
+                    table_count += 1
+                    if not in_table:
+                        self._release_element(element)
+                    continue
                 
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 3:
-                        commodity_data = self._extract_commodity_from_row(cells)
-                        if commodity_data:
-                            commodities.append(commodity_data)
+                if not in_table:
+                    continue
+                
+                cells = element.xpath('./td | ./th')
+                if len(cells) >= 3:
+                    commodity_data = self._extract_commodity_from_row(cells)
+                    if commodity_data:
+                        commodities.append(commodity_data)
             
+            self.logger.info(f"发现 {table_count} 个数据表格")
             self.logger.info(f"成功提取 {len(commodities)} 条商品数据")
             return commodities
             
@@ -111,41 +159,69 @@ class BusinessInsiderScraper(BaseScraper, WebScrapingMixin):
             self.logger.error(f"爬取Business Insider失败: {e}")
             return []
     
+    @staticmethod
+    def _release_element(element):
+        """释放已处理完的元素及其之前的兄弟节点，限制流式解析的内存占用"""
+        element.clear()
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+    
+    @staticmethod
+    def _cell_text(cell) -> str:
+        """获取单元格文本（各文本节点去除首尾空白后拼接）"""
+        return ''.join(text.strip() for text in cell.xpath('.//text()'))
+    
     def _extract_commodity_from_row(self, cells) -> Dict[str, Any]:
-        """从表格行中提取商品数据"""
-        try:
-            cell_texts = [cell.get_text(strip=True) for cell in cells]
+        """
+        从表格行中提取商品数据
+        
+        先检查名称列，表头等无效行不再读取其余单元格；价格和变化都找到后停止扫描。
+        变化只认含'%'的单元格，负价格、日期等含'+'/'-'的文本不会被误判。
+        
+        Args:
+            cells: 行内的单元格元素
             
+        Returns:
+            Dict[str, Any]: 商品数据，无法识别时返回None
+        """
+        try:
             # 提取商品名称
-            name = cell_texts[0]
+            name = self._cell_text(cells[0])
             if (not name or len(name) <= 2 or name.isdigit() or
-                'commodity' in name.lower() or 'price' in name.lower()):
+                _HEADER_RE.search(name)):
                 return None
             
             # 提取价格和变化
             price = None
             change = None
             
-            for text in cell_texts[1:]:
+            for cell in islice(cells, 1, None):
+                text = self._cell_text(cell)
+                
                 # 尝试提取价格
-                if price is None and re.search(r'\d+\.?\d*', text):
-                    price_match = re.search(r'(\d+,?\d*\.?\d*)', text.replace(',', ''))
+                if price is None:
+                    price_match = _PRICE_RE.search(text)
                     if price_match:
                         try:
-                            price = float(price_match.group(1))
+                            price = float(price_match.group(1).replace(',', ''))
                         except ValueError:
                             continue
                 
                 # 尝试提取变化
-                if change is None and ('%' in text or '+' in text or '-' in text):
+                if change is None and '%' in text:
                     change = text
+                
+                if price is not None and change is not None:
+                    break
             
             if not name or price is None:
                 return None
             
             return {
                 'name': name,
-                'chinese_name': self.commodity_translations.get(name, name),
+                'chinese_name': COMMODITY_TRANSLATIONS.get(name, name),
                 'price': price,
                 'current_price': price,
                 'change': change,
@@ -159,30 +235,7 @@ class BusinessInsiderScraper(BaseScraper, WebScrapingMixin):
     
     def _categorize_commodity(self, name: str) -> str:
         """为商品分类"""
-        name_lower = name.lower()
-        
-        # 能源类
-        energy_keywords = ['oil', 'gas', 'gasoline', 'heating', 'brent', 'wti', 'crude']
-        if any(keyword in name_lower for keyword in energy_keywords):
-            return "能源"
-        
-        # 贵金属
-        precious_metals = ['gold', 'silver', 'platinum', 'palladium']
-        if any(metal in name_lower for metal in precious_metals):
-            return "贵金属"
-        
-        # 工业金属
-        industrial_metals = ['copper', 'aluminum', 'aluminium', 'zinc', 'nickel', 'lead', 'tin']
-        if any(metal in name_lower for metal in industrial_metals):
-            return "工业金属"
-        
-        # 农产品
-        agriculture_keywords = ['corn', 'wheat', 'soybean', 'cotton', 'sugar', 'coffee', 'cocoa', 
-                               'cattle', 'hog', 'lumber', 'milk', 'orange', 'palm', 'rapeseed', 'rice']
-        if any(keyword in name_lower for keyword in agriculture_keywords):
-            return "农产品"
-        
-        return "其他"
+        return _categorize_name(name)
     
     def validate_data(self, data: Dict[str, Any]) -> bool:
         """验证数据有效性"""
@@ -206,7 +259,7 @@ class BusinessInsiderScraper(BaseScraper, WebScrapingMixin):
         if change_str and '%' in change_str:
             try:
                 # 提取百分比数值
-                percent_match = re.search(r'([+-]?\d+\.?\d*)%', change_str)
+                percent_match = _PERCENT_RE.search(change_str)
                 if percent_match:
                     change_percent = float(percent_match.group(1))
                     cleaned_data['change_percent'] = change_percent
@@ -9,6 +9,11 @@ from typing import List, Dict, Any, Optional, Union
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup, Tag
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..core import BaseScraper, WebScrapingMixin, BrowserScrapingMixin, get_config
 from ..data import CommodityData, ForexData
 
@@ -26,6 +31,11 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
         super().__init__(f"generic_{config_name}", **kwargs)
         self.config_name = config_name
         self.scraper_config = self._load_scraper_config()
+        self._prefetched_pages: Dict[str, str] = {}
+        
+        # requests方式的多个URL互不依赖，可在配置中用concurrent: true开启并发抓取（默认按顺序）
+        if 'concurrent_sources' not in kwargs and self.scraper_config.get('method', 'requests') == 'requests':
+            self.concurrent_sources = self.scraper_config.get('concurrent', False)
         
     def _load_scraper_config(self) -> Dict[str, Any]:
         """加载爬虫配置"""
@@ -69,6 +79,12 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
         self.logger.info(f"开始爬取 {self.config_name}: {url}")
         
         try:
+            # Selenium + HTML容器规则: 直接在浏览器内提取字段，跳过page_source和HTML解析
+            if method == 'selenium' and self._can_extract_in_browser():
+                data = self._scrape_with_selenium_dom(url)
+                self.logger.info(f"成功提取 {len(data)} 条数据")
+                return data
+            
             # 获取页面内容
             if method == 'requests':
                 content = self._scrape_with_requests(url)
@@ -95,13 +111,35 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
         response = self.get_page(url, headers=headers)
         return response.text
     
+    def scrape_all(self) -> List[Dict[str, Any]]:
+        """
+        爬取所有数据源
+        
+        Selenium方式且有多个URL时，先在多个标签页中并行加载全部页面，
+        之后逐个数据源只做解析。
+        """
+        sources = self.get_data_sources()
+        if (self.scraper_config.get('method') == 'selenium' and len(sources) > 1
+                and not self._can_extract_in_browser()):
+            from ..browser.selenium_controller import get_shared_pool
+            
+            with get_shared_pool().acquire() as controller:
+                self._prefetched_pages = controller.get_pages([source['url'] for source in sources])
+        
+        try:
+            return super().scrape_all()
+        finally:
+            self._prefetched_pages = {}
+    
     def _scrape_with_selenium(self, url: str) -> str:
         """使用Selenium获取内容"""
-        from ..browser.selenium_controller import SeleniumController
+        content = self._prefetched_pages.pop(url, None)
+        if content is not None:
+            return content
         
-        controller = SeleniumController(headless=True)
-        try:
-            controller.setup_driver()
+        from ..browser.selenium_controller import get_shared_pool
+        
+        with get_shared_pool().acquire() as controller:
             content = controller.get_page(url)
             
             # 等待动态内容加载
@@ -109,9 +147,56 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
             controller.driver.implicitly_wait(wait_time)
             
             return content
-        finally:
-            if controller.driver:
-                controller.close()
+    
+    def _can_extract_in_browser(self) -> bool:
+        """判断当前提取规则能否完全在浏览器内执行（需要容器选择器和字段规则）"""
+        extraction_rules = self.scraper_config.get('extraction', {})
+        return (self.scraper_config.get('parser', 'html') == 'html'
+                and bool(extraction_rules.get('container'))
+                and bool(extraction_rules.get('fields')))
+    
+    def _scrape_with_selenium_dom(self, url: str) -> List[Dict[str, Any]]:
+        """使用Selenium加载页面，并通过一次JavaScript调用提取所有数据项"""
+        from ..browser.selenium_controller import get_shared_pool
+        
+        extraction_rules = self.scraper_config['extraction']
+        field_rules = extraction_rules['fields']
+        fields = {}
+        for field_name, rule in field_rules.items():
+            if isinstance(rule, str):
+                fields[field_name] = (rule, None)
+            else:
+                fields[field_name] = (rule.get('selector'), rule.get('attribute'))
+        
+        with get_shared_pool().acquire() as controller:
+            content = controller.get_page(url)
+            rows = controller.extract_elements(extraction_rules['container'], fields)
+        
+        if rows is None:
+            # 浏览器内提取失败（如soupsieve专有的选择器），回退到page_source + BeautifulSoup解析
+            self.logger.info(f"↩️ 改用页面源码解析: {url}")
+            return self._parse_html(content, url)
+        
+        required_fields = self.scraper_config.get('required_fields', ['name'])
+        timestamp = self._get_current_timestamp()
+        data = []
+        for row in rows:
+            item_data = {
+                'source': self.config_name,
+                'url': url,
+                'timestamp': timestamp
+            }
+            for field_name, rule in field_rules.items():
+                value = row.get(field_name)
+                if value and isinstance(rule, dict):
+                    value = self._postprocess_value(value, rule)
+                if value:
+                    item_data[field_name] = value
+            
+            if all(field in item_data for field in required_fields):
+                data.append(item_data)
+        
+        return data
     
     def _scrape_with_applescript(self, url: str) -> str:
         """使用AppleScript获取内容"""
@@ -139,7 +224,7 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
     
     def _parse_html(self, content: str, url: str) -> List[Dict[str, Any]]:
         """解析HTML内容"""
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, 'lxml')
         data = []
         
         # 获取数据提取规则
@@ -153,22 +238,25 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
             # 默认查找表格行
             containers = soup.find_all(['tr', 'div', 'li'])
         
-        # 提取数据字段
+        # 提取数据字段（规则和必需字段每页只取一次）
         field_rules = extraction_rules.get('fields', {})
+        required_fields = self.scraper_config.get('required_fields', ['name'])
+        timestamp = self._get_current_timestamp()
         
         for container in containers:
-            item_data = self._extract_item_data(container, field_rules, url)
+            item_data = self._extract_item_data(container, field_rules, required_fields, url, timestamp)
             if item_data:
                 data.append(item_data)
         
         return data
     
-    def _extract_item_data(self, container: Tag, field_rules: Dict[str, Any], url: str) -> Optional[Dict[str, Any]]:
+    def _extract_item_data(self, container: Tag, field_rules: Dict[str, Any], required_fields: List[str],
+                           url: str, timestamp: str) -> Optional[Dict[str, Any]]:
         """从容器中提取数据项"""
         item_data = {
             'source': self.config_name,
             'url': url,
-            'timestamp': self._get_current_timestamp()
+            'timestamp': timestamp
         }
         
         try:
@@ -178,7 +266,6 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
                     item_data[field_name] = value
             
             # 验证必需字段
-            required_fields = self.scraper_config.get('required_fields', ['name'])
             if all(field in item_data for field in required_fields):
                 return item_data
             
@@ -197,8 +284,6 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
         elif isinstance(rule, dict):
             selector = rule.get('selector')
             attribute = rule.get('attribute')
-            regex_pattern = rule.get('regex')
-            transform = rule.get('transform')
             
             # 查找元素
             if selector:
@@ -217,19 +302,26 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
             if not value:
                 return None
             
-            # 正则提取
-            if regex_pattern:
-                match = re.search(regex_pattern, str(value))
-                value = match.group(1) if match else None
-            
-            # 数据转换
-            if value and transform:
-                value = self._transform_value(value, transform)
-            
-            return value
+            return self._postprocess_value(value, rule)
         
         return None
     
+    def _postprocess_value(self, value: str, rule: Dict[str, Any]) -> Optional[str]:
+        """对提取到的原始值应用正则提取和数据转换"""
+        regex_pattern = rule.get('regex')
+        transform = rule.get('transform')
+        
+        # 正则提取
+        if regex_pattern:
+            match = re.search(regex_pattern, str(value))
+            value = match.group(1) if match else None
+        
+        # 数据转换
+        if value and transform:
+            value = self._transform_value(value, transform)
+        
+        return value
+    
     def _transform_value(self, value: str, transform: str) -> str:
         """数据转换"""
         if transform == 'float':
@@ -248,7 +340,9 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
     def _parse_json(self, content: str, url: str) -> List[Dict[str, Any]]:
         """解析JSON内容"""
         try:
-            data = json.loads(content)
+            data = orjson.loads(content) if orjson else json.loads(content)
+            timestamp = self._get_current_timestamp()
+            field_mapping = self.scraper_config.get('field_mapping', {})
             
             # 获取数据路径
             data_path = self.scraper_config.get('json_path', '')
@@ -257,11 +351,10 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
                     data = data.get(key, {})
             
             if isinstance(data, list):
-                return [self._transform_json_item(item, url) for item in data]
+                return [self._transform_json_item(item, field_mapping, url, timestamp) for item in data]
             elif isinstance(data, dict):
                 # 检查是否是嵌套结构（如 CoinGecko API）
-                field_mapping = self.scraper_config.get('field_mapping', {})
-                if not any(key in field_mapping.values() for key in data.keys()):
+                if set(field_mapping.values()).isdisjoint(data):
                     # 嵌套结构，每个键值对是一个数据项
                     items = []
                     for coin_id, coin_data in data.items():
@@ -269,7 +362,7 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
                             coin_item = {
                                 'source': self.config_name,
                                 'url': url,
-                                'timestamp': self._get_current_timestamp(),
+                                'timestamp': timestamp,
                                 'name': coin_id
                             }
                             
@@ -278,30 +371,28 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
                                 if target_field != 'name' and source_field in coin_data:
                                     coin_item[target_field] = coin_data[source_field]
                             
-                            # Debug: 打印实际获取的数据
-                            self.logger.debug(f"币种 {coin_id} 原始数据: {coin_data}")
-                            self.logger.debug(f"处理后数据: {coin_item}")
+                            # Debug: 打印实际获取的数据（延迟格式化，未开启DEBUG时不生成字典的字符串）
+                            self.logger.debug("币种 %s 原始数据: %s", coin_id, coin_data)
+                            self.logger.debug("处理后数据: %s", coin_item)
                             
                             items.append(coin_item)
                     return items
                 else:
                     # 标准单项结构
-                    return [self._transform_json_item(data, url)]
+                    return [self._transform_json_item(data, field_mapping, url, timestamp)]
             
         except json.JSONDecodeError as e:
             self.logger.error(f"JSON解析失败: {e}")
         
         return []
     
-    def _transform_json_item(self, item: Dict[str, Any], url: str) -> Dict[str, Any]:
+    def _transform_json_item(self, item: Dict[str, Any], field_mapping: Dict[str, str], url: str,
+                             timestamp: str) -> Dict[str, Any]:
         """转换JSON数据项"""
-        # 字段映射
-        field_mapping = self.scraper_config.get('field_mapping', {})
-        
         transformed = {
             'source': self.config_name,
             'url': url,
-            'timestamp': self._get_current_timestamp()
+            'timestamp': timestamp
         }
         
         # 标准映射
@@ -315,6 +406,7 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
         """使用正则表达式解析内容"""
         patterns = self.scraper_config.get('regex_patterns', {})
         data = []
+        timestamp = self._get_current_timestamp()
         
         for pattern_name, pattern_config in patterns.items():
             pattern = pattern_config.get('pattern')
@@ -326,7 +418,7 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
                 item_data = {
                     'source': self.config_name,
                     'url': url,
-                    'timestamp': self._get_current_timestamp()
+                    'timestamp': timestamp
                 }
                 
                 for i, field_name in enumerate(fields):
@@ -410,7 +502,7 @@ class GenericScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
         elif clean_type == 'normalize_whitespace':
             return ' '.join(value_str.split())
         elif clean_type == 'remove_html':
-            return BeautifulSoup(value_str, 'html.parser').get_text()
+            return BeautifulSoup(value_str, 'lxml').get_text()
         
         return value
     
@@ -6,11 +6,24 @@
 import re
 import json
 from typing import List, Dict, Any, Optional, Union
-from bs4 import BeautifulSoup, Tag
+from lxml import etree
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from ..core import BaseScraper, WebScrapingMixin, get_config
 
 
+# 表格行及单元格（与BeautifulSoup的递归find_all语义一致）
+_ROWS_XPATH = etree.XPath('//table//tr')
+_CELLS_XPATH = etree.XPath('.//td | .//th')
+_TEXT_XPATH = etree.XPath('.//text()')
+_PRICE_RE = re.compile(r'(\d+,?\d*\.?\d*)')
+_HEADER_NAMES = frozenset(('name', 'symbol', 'commodity'))
+
+
 class SimpleGenericScraper(BaseScraper, WebScrapingMixin):
     """简化版通用配置驱动爬虫"""
     
@@ -19,6 +32,10 @@ class SimpleGenericScraper(BaseScraper, WebScrapingMixin):
         self.config_name = config_name
         self.scraper_config = self._load_scraper_config()
         
+        # 只支持requests方式，可在配置中用concurrent: true并发抓取多个URL（默认按顺序）
+        if 'concurrent_sources' not in kwargs:
+            self.concurrent_sources = self.scraper_config.get('concurrent', False)
+        
     def _load_scraper_config(self) -> Dict[str, Any]:
         """加载爬虫配置"""
         config = get_config()
@@ -87,23 +104,25 @@ class SimpleGenericScraper(BaseScraper, WebScrapingMixin):
     def _parse_simple_json(self, content: str, url: str) -> List[Dict[str, Any]]:
         """简单JSON解析"""
         try:
-            data = json.loads(content)
+            data = orjson.loads(content) if orjson else json.loads(content)
+            
+            # 简单处理：假设数据是一个对象，每个键都是一个数据项（专门为CoinGecko API设计）
+            if not isinstance(data, dict):
+                return []
             
-            # 简单处理：假设数据是一个对象，每个键都是一个数据项
-            items = []
-            if isinstance(data, dict):
-                for key, value in data.items():
-                    if isinstance(value, dict) and 'usd' in value:
-                        # 专门为CoinGecko API设计
-                        item = {
-                            'name': key,
-                            'current_price': value.get('usd'),
-                            'change_percent': 0.0,  # 添加默认的变化百分比
-                            'source': self.config_name,
-                            'url': url,
-                            'timestamp': self._get_current_timestamp()
-                        }
-                        items.append(item)
+            timestamp = self._get_current_timestamp()
+            items = [
+                {
+                    'name': key,
+                    'current_price': value.get('usd'),
+                    'change_percent': 0.0,  # 添加默认的变化百分比
+                    'source': self.config_name,
+                    'url': url,
+                    'timestamp': timestamp
+                }
+                for key, value in data.items()
+                if isinstance(value, dict) and 'usd' in value
+            ]
             
             return items
             
@@ -112,35 +131,45 @@ class SimpleGenericScraper(BaseScraper, WebScrapingMixin):
             return []
     
     def _parse_simple_html(self, content: str, url: str) -> List[Dict[str, Any]]:
-        """简单HTML解析"""
-        soup = BeautifulSoup(content, 'html.parser')
+        """简单HTML解析（lxml + 预编译XPath，只遍历表格行）"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        if not content.strip():
+            return []
+        
+        doc = etree.fromstring(content, etree.HTMLParser(encoding='utf-8'))
+        if doc is None:
+            return []
         
         # 查找表格数据
         data = []
-        tables = soup.find_all('table')
-        
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    name = cells[0].get_text(strip=True)
-                    price_text = cells[1].get_text(strip=True)
-                    
-                    # 提取价格
-                    price_match = re.search(r'(\d+,?\d*\.?\d*)', price_text.replace(',', ''))
-                    if price_match and name and not name.lower() in ['name', 'symbol', 'commodity']:
-                        item = {
-                            'name': name,
-                            'current_price': float(price_match.group(1)),
-                            'source': self.config_name,
-                            'url': url,
-                            'timestamp': self._get_current_timestamp()
-                        }
-                        data.append(item)
+        timestamp = self._get_current_timestamp()
+        
+        for row in _ROWS_XPATH(doc):
+            cells = _CELLS_XPATH(row)
+            if len(cells) >= 2:
+                name = self._cell_text(cells[0])
+                price_text = self._cell_text(cells[1])
+                
+                # 提取价格
+                price_match = _PRICE_RE.search(price_text.replace(',', ''))
+                if price_match and name and name.lower() not in _HEADER_NAMES:
+                    item = {
+                        'name': name,
+                        'current_price': float(price_match.group(1)),
+                        'source': self.config_name,
+                        'url': url,
+                        'timestamp': timestamp
+                    }
+                    data.append(item)
         
         return data
     
+    @staticmethod
+    def _cell_text(cell) -> str:
+        """获取单元格文本（各文本节点去除首尾空白后拼接，等同get_text(strip=True)）"""
+        return ''.join(text.strip() for text in _TEXT_XPATH(cell))
+    
     def validate_data(self, data: Dict[str, Any]) -> bool:
         """简单数据验证"""
         required_fields = self.scraper_config.get('required_fields', ['name', 'current_price'])
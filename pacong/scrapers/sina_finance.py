@@ -215,6 +215,7 @@ class SinaFinanceScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
     def clean_data(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """清理数据"""
         cleaned_data = []
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         for item in data:
             # 统一字段名
@@ -227,7 +228,7 @@ class SinaFinanceScraper(BaseScraper, WebScrapingMixin, BrowserScrapingMixin):
                 'date': item.get('date', ''),
                 'time': item.get('time', ''),
                 'source': item.get('source', 'sina_finance'),
-                'timestamp': item.get('timestamp', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                'timestamp': item.get('timestamp', timestamp)
             }
             
             # 如果有原始数据，也保留
@@ -3,14 +3,51 @@
 下载和解析世界银行商品价格指数Excel文件
 """
 
-from typing import List, Dict, Any
-import pandas as pd
+import hashlib
+import json
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 from datetime import datetime
-from io import BytesIO
+from pathlib import Path
 
-from ..core import BaseScraper, WebScrapingMixin
+from ..core import BaseScraper, WebScrapingMixin, FileCache
 from ..data import CommodityData
 
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+try:
+    import python_calamine
+except ImportError:
+    python_calamine = None
+
+# pandas从2.2起才支持calamine读取引擎
+_CALAMINE_MIN_PANDAS = (2, 2)
+
+# 下载分块大小：边下载边写盘，内存中只保留一个分块
+_DOWNLOAD_CHUNK_SIZE = 100 * 1024
+
+
+def _excel_read_engine(pd: 'pd') -> str:
+    """
+    选择Excel读取引擎：安装了python-calamine（Rust实现）且pandas>=2.2时优先使用，
+    解析更快、内存更低；否则沿用openpyxl
+    
+    Args:
+        pd: 已导入的pandas模块
+        
+    Returns:
+        str: pandas.ExcelFile的engine参数
+    """
+    if python_calamine is None:
+        return 'openpyxl'
+    try:
+        pandas_version = tuple(int(part) for part in pd.__version__.split('.')[:2])
+    except ValueError:
+        return 'openpyxl'
+    return 'calamine' if pandas_version >= _CALAMINE_MIN_PANDAS else 'openpyxl'
+
 
 class WorldBankScraper(BaseScraper, WebScrapingMixin):
     """世界银行商品数据爬虫"""
@@ -21,6 +58,10 @@ class WorldBankScraper(BaseScraper, WebScrapingMixin):
         # 世界银行数据URL
         self.data_url = "https://thedocs.worldbank.org/en/doc/18675f1d1639c7a34d463f59263ba0a2-0050012025/related/CMO-Historical-Data-Monthly.xlsx"
         
+        # 月度数据，下载结果在磁盘缓存中保留一天，重复运行不再重新下载
+        self.download_cache = FileCache(self.output_dir / '.cache')
+        self.download_cache_ttl = kwargs.get('download_cache_ttl', 24 * 3600)
+        
         # 目标工作表名称
         self.target_sheets = [
             'Monthly Indices',
@@ -62,41 +103,146 @@ class WorldBankScraper(BaseScraper, WebScrapingMixin):
         try:
             self.logger.info(f"正在下载世界银行Excel文件: {url}")
             
-            # 使用更长的超时时间下载Excel文件
-            response = self.make_request(url, timeout=60)
+            # 流式下载到磁盘缓存文件，按路径交给pandas读取，不在内存中保留整个文件
+            excel_path = self._download_excel(url)
             
-            if not response or response.status_code != 200:
-                self.logger.error(f"下载失败，状态码: {response.status_code if response else 'None'}")
-                return []
+            self.logger.info(f"Excel文件获取成功，大小: {excel_path.stat().st_size} 字节")
             
-            self.logger.info(f"Excel文件下载成功，大小: {len(response.content)} 字节")
+            # 解析结果按URL缓存，并记录对应工作簿的内容摘要：摘要一致说明文件未更新，
+            # 直接复用而不看有效期（304重新验证后同样命中）；文件更新后新结果覆盖旧条目
+            parsed_key = (url, 'parsed', *self.target_sheets)
+            digest = self._file_digest(excel_path)
+            all_data = self._load_parsed_data(parsed_key, digest)
+            if all_data is not None:
+                self.logger.info("♻️ 工作簿未变化，使用已解析的数据")
+                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                for item in all_data:
+                    item['timestamp'] = timestamp
+            else:
+                all_data = self._parse_workbook(excel_path)
+                if all_data and self.download_cache_ttl > 0:
+                    payload = {'digest': digest, 'data': all_data}
+                    self.download_cache.set(parsed_key, json.dumps(payload, ensure_ascii=False).encode('utf-8'))
             
-            # 使用BytesIO读取Excel内容
-            excel_content = BytesIO(response.content)
-            xls = pd.ExcelFile(excel_content)
+            self.logger.info(f"成功解析 {len(all_data)} 条数据")
+            return all_data
             
-            self.logger.info(f"Excel工作表: {xls.sheet_names}")
+        except Exception as e:
+            self.logger.error(f"下载和解析Excel文件失败: {e}")
+            return []
+    
+    def _load_parsed_data(self, parsed_key: tuple, digest: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        读取与当前工作簿内容摘要一致的已解析数据
+        
+        Args:
+            parsed_key: 解析结果的缓存键
+            digest: 当前工作簿的内容摘要
+            
+        Returns:
+            Optional[List[Dict[str, Any]]]: 已解析的数据，缓存未启用、不存在或摘要不一致时返回None
+        """
+        if self.download_cache_ttl <= 0:
+            return None
+        
+        path = self.download_cache.get_stale_path(parsed_key)
+        if path is None:
+            return None
+        
+        try:
+            payload = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        
+        if not isinstance(payload, dict) or payload.get('digest') != digest:
+            return None
+        return payload.get('data')
+    
+    def _parse_workbook(self, excel_path: Path) -> List[Dict[str, Any]]:
+        """
+        解析工作簿中的各目标工作表
+        
+        Args:
+            excel_path: 本地Excel文件路径
             
-            all_data = []
+        Returns:
+            List[Dict[str, Any]]: 各工作表提取的数据
+        """
+        # pandas只在真正解析时导入，导入爬虫模块（如注册/列出爬虫）时无需加载
+        import pandas as pd
+        
+        all_data = []
+        
+        with pd.ExcelFile(excel_path, engine=_excel_read_engine(pd)) as xls:
+            self.logger.info(f"Excel工作表: {xls.sheet_names}")
+            available_sheets = set(xls.sheet_names)
             
             # 处理每个目标工作表
             for sheet_name in self.target_sheets:
-                if sheet_name in xls.sheet_names:
+                if sheet_name in available_sheets:
                     self.logger.info(f"正在解析工作表: {sheet_name}")
                     sheet_data = self._parse_sheet(xls, sheet_name)
                     all_data.extend(sheet_data)
                 else:
                     self.logger.warning(f"工作表 {sheet_name} 不存在")
+        
+        return all_data
+    
+    @staticmethod
+    def _file_digest(path: Path) -> str:
+        """分块计算文件内容的MD5摘要"""
+        digest = hashlib.md5()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_DOWNLOAD_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _download_excel(self, url: str) -> Path:
+        """
+        下载Excel文件到磁盘缓存（有效期内直接复用已下载的文件，过期后先向服务器确认是否有更新）
+        
+        Args:
+            url: 文件地址
             
-            self.logger.info(f"成功解析 {len(all_data)} 条数据")
-            return all_data
+        Returns:
+            Path: 本地文件路径
+        """
+        key = (url,)
+        cached_path = self.download_cache.get_path(key, self.download_cache_ttl)
+        if cached_path is not None:
+            self.logger.info(f"♻️ 命中磁盘缓存: {url}")
+            return cached_path
+        
+        # 已有过期文件时带上ETag/Last-Modified做条件请求，服务器返回304则无需重新下载
+        headers = {}
+        stale_path = self.download_cache.get_stale_path(key)
+        if stale_path is not None:
+            validators = self.download_cache.get_meta(key)
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        
+        # 使用更长的超时时间，分块写入临时文件后原子替换
+        with self.get_page(url, stream=True, timeout=60, headers=headers) as response:
+            if response.status_code == 304 and stale_path is not None:
+                self.logger.info(f"♻️ 文件未更新，沿用本地缓存: {url}")
+                self.download_cache.touch(key)
+                return stale_path
             
-        except Exception as e:
-            self.logger.error(f"下载和解析Excel文件失败: {e}")
-            return []
+            path = self.download_cache.write_stream(
+                key, response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE)
+            )
+            self.download_cache.set_meta(key, {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            })
+            return path
     
-    def _parse_sheet(self, xls: pd.ExcelFile, sheet_name: str) -> List[Dict[str, Any]]:
+    def _parse_sheet(self, xls: 'pd.ExcelFile', sheet_name: str) -> List[Dict[str, Any]]:
         """解析单个工作表"""
+        import pandas as pd
+        
         try:
             # 尝试不同的header位置
             for header_row in [0, 1, 2, 3, 4, 5, 6]:
@@ -118,51 +264,48 @@ class WorldBankScraper(BaseScraper, WebScrapingMixin):
             self.logger.error(f"解析工作表 {sheet_name} 失败: {e}")
             return []
     
-    def _extract_commodity_data(self, df: pd.DataFrame, sheet_name: str) -> List[Dict[str, Any]]:
-        """从DataFrame中提取商品数据"""
+    def _extract_commodity_data(self, df: 'pd.DataFrame', sheet_name: str) -> List[Dict[str, Any]]:
+        """
+        从DataFrame中提取商品数据
+        
+        整表一次性找出每行最右侧的数值单元格作为最新价格，不再逐行iterrows、逐列回溯。
+        """
+        import numpy as np
+        
         data = []
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         try:
-            # 获取第一列作为商品名称列
-            name_column = df.columns[0]
-            
-            # 查找包含商品类别的行
-            for index, row in df.iterrows():
-                commodity_name = str(row[name_column]).strip()
-                
-                # 跳过空值和NaN
-                if pd.isna(commodity_name) or commodity_name == '' or commodity_name == 'nan':
-                    continue
-                
-                # 检查是否是已知的商品类别
-                chinese_name = self.commodity_mapping.get(commodity_name, commodity_name)
-                
-                # 获取最新的价格数据（取最后一个非空的数值列）
-                price = None
-                date_str = None
-                
-                # 从右到左查找最新的价格数据
-                for col in reversed(df.columns[1:]):
-                    try:
-                        value = row[col]
-                        if pd.notna(value) and isinstance(value, (int, float)):
-                            price = float(value)
-                            date_str = str(col)
-                            break
-                    except:
-                        continue
-                
-                if price is not None:
-                    data.append({
-                        'name': commodity_name,
-                        'chinese_name': chinese_name,
-                        'price': price,
-                        'date': date_str,
-                        'sheet': sheet_name,
-                        'category': self._categorize_commodity(commodity_name),
-                        'source': 'worldbank',
-                        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    })
+            # 获取第一列作为商品名称列，跳过空值和NaN
+            names = df.iloc[:, 0].map(str).str.strip()
+            name_mask = ~names.isin(('', 'nan')).to_numpy()
+            
+            # 只保留int/float单元格（与原逐格isinstance判断一致），其余视为缺失
+            value_columns = df.columns[1:]
+            if len(value_columns) == 0:
+                return []
+            numeric = np.column_stack([
+                self._numeric_column(df.iloc[:, i]) for i in range(1, len(df.columns))
+            ])
+            
+            # 每行最右侧的非空数值即最新价格
+            valid = ~np.isnan(numeric)
+            has_price = valid.any(axis=1) & name_mask
+            last_col = valid.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)
+            
+            for row_idx in np.flatnonzero(has_price):
+                commodity_name = names.iat[row_idx]
+                col_idx = last_col[row_idx]
+                data.append({
+                    'name': commodity_name,
+                    'chinese_name': self.commodity_mapping.get(commodity_name, commodity_name),
+                    'price': float(numeric[row_idx, col_idx]),
+                    'date': str(value_columns[col_idx]),
+                    'sheet': sheet_name,
+                    'category': self._categorize_commodity(commodity_name),
+                    'source': 'worldbank',
+                    'timestamp': timestamp
+                })
             
             self.logger.info(f"从工作表 {sheet_name} 提取了 {len(data)} 条数据")
             return data
@@ -171,6 +314,17 @@ class WorldBankScraper(BaseScraper, WebScrapingMixin):
             self.logger.error(f"提取商品数据失败: {e}")
             return []
     
+    @staticmethod
+    def _numeric_column(column: 'pd.Series') -> 'np.ndarray':
+        """将一列转换为float数组，非int/float单元格置为NaN"""
+        import numpy as np
+        import pandas as pd
+        
+        if pd.api.types.is_numeric_dtype(column):
+            return column.to_numpy(dtype=float, na_value=np.nan)
+        is_number = column.map(lambda value: isinstance(value, (int, float))).to_numpy(dtype=bool)
+        return np.where(is_number, pd.to_numeric(column.where(is_number), errors='coerce'), np.nan).astype(float)
+    
     def validate_data(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """验证数据"""
         valid_data = []
@@ -191,6 +345,7 @@ class WorldBankScraper(BaseScraper, WebScrapingMixin):
     def clean_data(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """清理数据"""
         cleaned_data = []
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         for item in data:
             cleaned_item = {
@@ -202,7 +357,7 @@ class WorldBankScraper(BaseScraper, WebScrapingMixin):
                 'category': item.get('category', '其他'),
                 'sheet_source': item.get('sheet', ''),
                 'source': 'worldbank',
-                'timestamp': item.get('timestamp', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                'timestamp': item.get('timestamp', timestamp)
             }
             
             cleaned_data.append(cleaned_item)
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from fastapi import FastAPI
 from pydantic import BaseModel
@@ -17,6 +20,19 @@ app = FastAPI()
 
 BASE_REPORT_DIR = Path(__file__).resolve().parent / "reports"
 
+# Bounded pool for blocking scrape runs, shared by all requests.
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SCRAPE_WORKERS", "16")),
+    thread_name_prefix="scrape",
+)
+
+# Services are reused per (user_id, session_id); least recently used ones are evicted.
+_SERVICE_CACHE_SIZE = int(os.getenv("SCRAPE_SERVICE_CACHE_SIZE", "256"))
+_SERVICE_CACHE: "OrderedDict[Tuple[str, str], CommodityService]" = OrderedDict()
+
+# Seconds a session may reuse its last scrape result; 0 disables the data cache.
+_DATA_CACHE_TTL = int(os.getenv("SCRAPE_CACHE_TTL", "0"))
+
 
 class ScrapeRequest(BaseModel):
     user_id: str
@@ -24,16 +40,37 @@ class ScrapeRequest(BaseModel):
     scraper_names: Optional[List[str]] = None
 
 
+def _get_service(user_id: str, session_id: str) -> CommodityService:
+    """Return the cached service for a user session, creating it on first use."""
+    key = (user_id, session_id)
+    service = _SERVICE_CACHE.get(key)
+    if service is None:
+        service = CommodityService(
+            output_dir=BASE_REPORT_DIR / user_id / session_id,
+            cache_ttl=_DATA_CACHE_TTL,
+        )
+        _SERVICE_CACHE[key] = service
+        if len(_SERVICE_CACHE) > _SERVICE_CACHE_SIZE:
+            _SERVICE_CACHE.popitem(last=False)
+    else:
+        _SERVICE_CACHE.move_to_end(key)
+    return service
+
+
 @app.post("/scrape")
 async def scrape(req: ScrapeRequest):
     """Run commodity scrapers asynchronously for a user session."""
-    output_dir = BASE_REPORT_DIR / req.user_id / req.session_id
-    service = CommodityService(output_dir=output_dir)
+    service = _get_service(req.user_id, req.session_id)
 
-    result = await asyncio.to_thread(service.run_full_analysis, req.scraper_names)
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(_EXECUTOR, service.run_full_analysis, req.scraper_names)
 
     return {
         "files": result.get("files", {}),
         "summary": result.get("summary", {}),
     }
 
+
+@app.on_event("shutdown")
+def _shutdown_executor():
+    _EXECUTOR.shutdown(wait=False, cancel_futures=True)
@@ -3,17 +3,25 @@
 提供高级的商品数据获取和处理功能
 """
 
-from typing import List, Dict, Any, Optional, Union
+import heapq
+import json
+from typing import List, Dict, Any, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from threading import Lock
 
-from ..core import get_logger, get_config
+from ..core import get_logger, get_config, FileCache
 from ..data import CommodityData, DataProcessor, DataValidator
 from ..scrapers import ScraperFactory
 from ..output.csv_writer import CSVWriter
 from ..output.excel_writer import ExcelWriter
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 _file_locks: Dict[Path, Lock] = {}
 
@@ -26,10 +34,24 @@ def _get_lock(path: Path) -> Lock:
     return lock
 
 
+def _dumps(obj: Any) -> bytes:
+    """序列化为JSON字节，优先使用orjson"""
+    if orjson:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """解析JSON字节，优先使用orjson"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class CommodityService:
     """商品数据服务"""
 
-    def __init__(self, output_dir: Optional[Union[str, Path]] = None):
+    def __init__(self, output_dir: Optional[Union[str, Path]] = None, cache_ttl: int = 0):
         self.logger = get_logger(__name__)
         self.config = get_config()
         self.data_processor = DataProcessor()
@@ -42,8 +64,19 @@ class CommodityService:
             self.output_dir = Path(self.config.output.reports_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # 数据缓存：有效期内重复收集直接返回缓存结果，默认关闭（cache_ttl <= 0），关闭时不创建缓存目录
+        self.cache_ttl = cache_ttl
+        self.data_cache = FileCache(self.output_dir / '.cache') if cache_ttl > 0 else None
+
+        # 可用爬虫列表在服务生命周期内基本不变，初始化时取一次
+        self._available_scrapers = tuple(ScraperFactory.list_available_scrapers())
+
         self.logger.info("商品数据服务初始化完成")
     
+    def refresh_scrapers(self):
+        """重新读取已注册的爬虫列表（长期运行的服务在注册新爬虫后调用）"""
+        self._available_scrapers = tuple(ScraperFactory.list_available_scrapers())
+    
     def collect_all_commodity_data(self, scraper_names: Optional[List[str]] = None) -> List[CommodityData]:
         """
         收集所有商品数据
@@ -58,27 +91,23 @@ class CommodityService:
         
         # 获取爬虫列表
         if scraper_names is None:
-            scraper_names = ScraperFactory.list_available_scrapers()
+            scraper_names = list(self._available_scrapers)
+        
+        # 合并去重时保留先出现的数据，爬虫顺序不同结果也不同，缓存键保留原始顺序
+        cache_key = ('commodity_data', *scraper_names)
+        cached_data = self._load_cached_data(cache_key)
+        if cached_data is not None:
+            self.logger.info(f"♻️ 使用缓存数据: {len(cached_data)} 条")
+            return cached_data
         
         all_raw_data = []
         
-        # 使用每个爬虫收集数据
-        for scraper_name in scraper_names:
-            try:
-                self.logger.info(f"📊 使用爬虫: {scraper_name}")
-                
-                with ScraperFactory.create_scraper(scraper_name) as scraper:
-                    if scraper:
-                        raw_data = scraper.scrape_all()
-                        all_raw_data.extend(raw_data)
-                        
-                        self.logger.info(f"✅ {scraper_name}: 获取 {len(raw_data)} 条原始数据")
-                    else:
-                        self.logger.warning(f"⚠️ 无法创建爬虫: {scraper_name}")
-                        
-            except Exception as e:
-                self.logger.error(f"❌ 爬虫 {scraper_name} 执行失败: {e}")
-                continue
+        # 各爬虫相互独立且以网络等待为主，并发执行，结果按爬虫顺序合并
+        if scraper_names:
+            max_workers = min(len(scraper_names), self.config.scraping.max_concurrent_requests)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for raw_data in executor.map(self._run_scraper, scraper_names):
+                    all_raw_data.extend(raw_data)
         
         self.logger.info(f"📋 总共收集 {len(all_raw_data)} 条原始数据")
         
@@ -98,8 +127,71 @@ class CommodityService:
             validation_summary = self.data_validator.get_validation_summary(invalid_data)
             self.logger.info(f"验证摘要: {validation_summary}")
         
+        self._save_cached_data(cache_key, merged_data)
         return merged_data
     
+    def _load_cached_data(self, cache_key: Tuple[str, ...]) -> Optional[List[CommodityData]]:
+        """
+        读取未过期的缓存数据
+        
+        Args:
+            cache_key: 缓存键（按调用顺序排列的爬虫名称）
+            
+        Returns:
+            Optional[List[CommodityData]]: 缓存数据，无有效缓存时返回None
+        """
+        if self.data_cache is None:
+            return None
+        
+        payload = self.data_cache.get(cache_key, self.cache_ttl)
+        if payload is None:
+            return None
+        
+        try:
+            return [CommodityData.from_dict(item) for item in _loads(payload)]
+        except Exception as e:
+            self.logger.warning(f"读取缓存失败: {e}")
+            return None
+    
+    def _save_cached_data(self, cache_key: Tuple[str, ...], commodities: List[CommodityData]):
+        """
+        写入缓存数据
+        
+        Args:
+            cache_key: 缓存键（按调用顺序排列的爬虫名称）
+            commodities: 商品数据列表
+        """
+        if self.data_cache is None:
+            return
+        
+        self.data_cache.set(cache_key, _dumps([c.to_dict() for c in commodities]))
+    
+    def _run_scraper(self, scraper_name: str) -> List[Dict[str, Any]]:
+        """
+        运行单个爬虫
+        
+        Args:
+            scraper_name: 爬虫名称
+            
+        Returns:
+            List[Dict]: 原始数据列表，失败时返回空列表
+        """
+        try:
+            self.logger.info(f"📊 使用爬虫: {scraper_name}")
+            
+            with ScraperFactory.create_scraper(scraper_name) as scraper:
+                if scraper:
+                    raw_data = scraper.scrape_all()
+                    self.logger.info(f"✅ {scraper_name}: 获取 {len(raw_data)} 条原始数据")
+                    return raw_data
+                
+                self.logger.warning(f"⚠️ 无法创建爬虫: {scraper_name}")
+                
+        except Exception as e:
+            self.logger.error(f"❌ 爬虫 {scraper_name} 执行失败: {e}")
+        
+        return []
+    
     def get_commodity_by_category(self, commodities: List[CommodityData]) -> Dict[str, List[CommodityData]]:
         """
         按分类分组商品数据
@@ -110,17 +202,11 @@ class CommodityService:
         Returns:
             Dict[str, List[CommodityData]]: 按分类分组的商品数据
         """
-        categories = {}
+        # 先按分类首次出现的顺序建好分组，再按价格整体排序一次后依次放入，各分类内自然有序
+        categories = {commodity.category or "其他": [] for commodity in commodities}
         
-        for commodity in commodities:
-            category = commodity.category or "其他"
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(commodity)
-        
-        # 按价格排序每个分类
-        for category in categories:
-            categories[category].sort(key=lambda x: x.current_price or 0, reverse=True)
+        for commodity in sorted(commodities, key=lambda x: x.current_price or 0, reverse=True):
+            categories[commodity.category or "其他"].append(commodity)
         
         return categories
     
@@ -138,30 +224,23 @@ class CommodityService:
         # 过滤有变化百分比的商品
         commodities_with_change = [c for c in commodities if c.change_percent is not None]
         
-        # 涨幅最大
-        top_gainers = sorted(
-            commodities_with_change, 
-            key=lambda x: x.change_percent, 
-            reverse=True
-        )[:limit]
-        
-        # 跌幅最大
-        top_losers = sorted(
-            commodities_with_change, 
-            key=lambda x: x.change_percent
-        )[:limit]
+        # 只取前limit个，用堆选取代整表排序（结果与sorted(...)[:limit]一致）
+        top_gainers = heapq.nlargest(limit, commodities_with_change, key=lambda x: x.change_percent)
+        top_losers = heapq.nsmallest(limit, commodities_with_change, key=lambda x: x.change_percent)
         
         return {
             'top_gainers': top_gainers,
             'top_losers': top_losers
         }
     
-    def generate_market_summary(self, commodities: List[CommodityData]) -> Dict[str, Any]:
+    def generate_market_summary(self, commodities: List[CommodityData],
+                                run_time: Optional[datetime] = None) -> Dict[str, Any]:
         """
         生成市场摘要
         
         Args:
             commodities: 商品数据列表
+            run_time: 本次分析的时间，默认取当前时间
             
         Returns:
             Dict: 市场摘要信息
@@ -169,37 +248,44 @@ class CommodityService:
         if not commodities:
             return {"error": "无商品数据"}
         
-        # 基本统计
+        # 基本统计与分类统计在同一次遍历中累计，同时收集有涨跌数据的商品供排行使用
         total_commodities = len(commodities)
-        commodities_with_change = [c for c in commodities if c.change_percent is not None]
+        commodities_with_change = []
+        change_sum = 0.0
+        gainers = losers = 0
+        category_totals: Dict[str, List[float]] = {}  # 分类 -> [数量, 涨跌幅合计, 有涨跌数据的数量]
         
-        if commodities_with_change:
-            avg_change = sum(c.change_percent for c in commodities_with_change) / len(commodities_with_change)
-            gainers = len([c for c in commodities_with_change if c.change_percent > 0])
-            losers = len([c for c in commodities_with_change if c.change_percent < 0])
-            unchanged = len(commodities_with_change) - gainers - losers
-        else:
-            avg_change = 0
-            gainers = losers = unchanged = 0
-        
-        # 按分类统计
-        categories = self.get_commodity_by_category(commodities)
-        category_stats = {}
-        
-        for category, items in categories.items():
-            items_with_change = [c for c in items if c.change_percent is not None]
-            if items_with_change:
-                cat_avg_change = sum(c.change_percent for c in items_with_change) / len(items_with_change)
-            else:
-                cat_avg_change = 0
+        for commodity in commodities:
+            totals = category_totals.setdefault(commodity.category or "其他", [0, 0.0, 0])
+            totals[0] += 1
             
-            category_stats[category] = {
-                'count': len(items),
-                'avg_change': round(cat_avg_change, 2)
+            change = commodity.change_percent
+            if change is None:
+                continue
+            
+            totals[1] += change
+            totals[2] += 1
+            commodities_with_change.append(commodity)
+            change_sum += change
+            if change > 0:
+                gainers += 1
+            elif change < 0:
+                losers += 1
+        
+        with_change_count = len(commodities_with_change)
+        avg_change = change_sum / with_change_count if with_change_count else 0
+        unchanged = with_change_count - gainers - losers
+        
+        category_stats = {
+            category: {
+                'count': count,
+                'avg_change': round(category_change_sum / change_count, 2) if change_count else 0
             }
+            for category, (count, category_change_sum, change_count) in category_totals.items()
+        }
         
-        # 表现最佳
-        performers = self.get_top_performers(commodities, 5)
+        # 表现最佳（复用已过滤的列表）
+        performers = self.get_top_performers(commodities_with_change, 5)
         
         return {
             'summary': {
@@ -208,7 +294,7 @@ class CommodityService:
                 'gainers': gainers,
                 'losers': losers,
                 'unchanged': unchanged,
-                'data_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'data_time': (run_time or datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
             },
             'category_stats': category_stats,
             'top_performers': {
@@ -282,12 +368,19 @@ class CommodityService:
             self.logger.error("❌ 未获取到任何商品数据")
             return {"error": "未获取到商品数据"}
         
-        # 生成摘要
-        summary = self.generate_market_summary(commodities)
+        # 本次运行统一使用同一时间，摘要时间与CSV/Excel文件名保持一致
+        run_time = datetime.now()
+        timestamp = run_time.strftime(self.config.output.timestamp_format)
         
-        # 保存文件
-        csv_file = self.save_to_csv(commodities)
-        excel_file = self.save_to_excel(commodities)
+        # 生成摘要
+        summary = self.generate_market_summary(commodities, run_time)
+        
+        # 保存文件：CSV与Excel写入不同文件、互不依赖，并行写出
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            csv_future = executor.submit(self.save_to_csv, commodities, f"commodity_data_{timestamp}.csv")
+            excel_future = executor.submit(self.save_to_excel, commodities, f"commodity_data_{timestamp}.xlsx")
+            csv_file = csv_future.result()
+            excel_file = excel_future.result()
         
         self.logger.info("✅ 完整分析完成")
         
@@ -5,16 +5,58 @@
 
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
+import csv
 from datetime import datetime
 import re
 import logging
 import json
+import soupsieve
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 价格解析用的正则，避免在逐行循环中重复查找编译缓存
+HAS_NUMBER_RE = re.compile(r'\d+\.?\d*')
+PRICE_RE = re.compile(r'(\d+,?\d*\.?\d*)')
+# 首列含这些词的行视为表头
+HEADER_WORDS = ('commodity', 'price')
+JSON_PRICE_RE = re.compile(r'\{[^{}]*"price"[^{}]*\}')
+COMMODITY_PATTERN_RE = re.compile(r'"([A-Z]{2,})"[^"]*"(\d+\.?\d*)"')
+# 直接在原始HTML上提取script内容，并筛出可能含行情数据的脚本
+SCRIPT_BODY_RE = re.compile(r'<script\b[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+SCRIPT_DATA_RE = re.compile(r'commodity|market|"price"', re.IGNORECASE)
+
+# Bloomberg数据行内各字段的选择器（预编译，先按data-type查找，找不到再按类名回退）
+NAME_SELECTORS = (
+    soupsieve.compile('td[data-type="name"], th[data-type="name"], div[data-type="name"]'),
+    soupsieve.compile('td[class*="name"], th[class*="name"], div[class*="name"]'),
+)
+PRICE_SELECTORS = (
+    soupsieve.compile('td[data-type="value"], div[data-type="value"]'),
+    soupsieve.compile('td[class*="price"], div[class*="price"]'),
+)
+CHANGE_SELECTORS = (
+    soupsieve.compile('td[data-type="percentChange"], div[data-type="percentChange"]'),
+    soupsieve.compile('td[class*="change"], div[class*="change"]'),
+)
+DATA_ROW_SELECTOR = soupsieve.compile('div[class*="row"][class*="data"]')
+
+def select_first(element, selectors):
+    """按优先级依次尝试选择器，返回第一个匹配的元素"""
+    for selector in selectors:
+        found = selector.select_one(element)
+        if found is not None:
+            return found
+    return None
+
+def has_data_class(class_name):
+    """判断类名是否像数据容器（table/data/market），只转换一次小写"""
+    if not class_name:
+        return False
+    lowered = class_name.lower()
+    return 'table' in lowered or 'data' in lowered or 'market' in lowered
+
 def test_bloomberg_scraping():
     """测试Bloomberg商品页面爬取"""
     
@@ -49,14 +91,15 @@ def test_bloomberg_scraping():
             print("💾 页面源码已保存到 reports/bloomberg_source.html")
             
             # 解析页面
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml')
+            script_texts = SCRIPT_BODY_RE.findall(response.text)
             
             # 分析页面结构
             print(f"\n📊 页面结构分析:")
             print(f"   标题: {soup.title.text if soup.title else 'No title'}")
             print(f"   表格数量: {len(soup.find_all('table'))}")
             print(f"   行数 (tr): {len(soup.find_all('tr'))}")
-            print(f"   脚本标签: {len(soup.find_all('script'))}")
+            print(f"   脚本标签: {len(script_texts)}")
             
             # 查找可能的数据容器
             data_containers = []
@@ -72,20 +115,12 @@ def test_bloomberg_scraping():
                 data_containers.append(('bloomberg_modules', bloomberg_data))
             
             # 3. 查找class中包含table或data的元素
-            data_divs = soup.find_all('div', class_=lambda x: x and (
-                'table' in x.lower() or 'data' in x.lower() or 'market' in x.lower()
-            ))
+            data_divs = soup.find_all('div', class_=has_data_class)
             if data_divs:
                 data_containers.append(('data_divs', data_divs))
             
             # 4. 查找可能包含JSON数据的script标签
-            scripts = soup.find_all('script')
-            json_scripts = []
-            for script in scripts:
-                if script.string and ('commodity' in script.string.lower() or 
-                                     'market' in script.string.lower() or
-                                     '"price"' in script.string.lower()):
-                    json_scripts.append(script)
+            json_scripts = [text for text in script_texts if SCRIPT_DATA_RE.search(text)]
             
             if json_scripts:
                 data_containers.append(('json_scripts', json_scripts))
@@ -96,77 +131,71 @@ def test_bloomberg_scraping():
             
             # 尝试提取商品数据
             commodities = []
+            scraped_at = datetime.now().isoformat()  # 本次爬取所有行共用同一时间戳
+            
+            # 方法1: 从表格提取（所有表格行一次选出，不再逐个表格查找）
+            table_rows = soup.select('table tr')
+            print(f"\n📊 分析表格行 (共 {len(table_rows)} 行)...")
             
-            # 方法1: 从表格提取
-            for table in tables:
-                rows = table.find_all('tr')
-                print(f"\n📊 分析表格 (包含 {len(rows)} 行)...")
+            for row in table_rows:
+                cells = row.find_all(['td', 'th'])
+                if len(cells) < 3:
+                    continue
                 
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 3:
-                        cell_texts = [cell.get_text(strip=True) for cell in cells]
-                        
-                        # 查找商品信息
-                        first_cell = cell_texts[0]
-                        if (first_cell and len(first_cell) > 2 and 
-                            not first_cell.isdigit() and
-                            'commodity' not in first_cell.lower() and
-                            'price' not in first_cell.lower()):
-                            
-                            price = None
-                            change = None
-                            
-                            for text in cell_texts[1:]:
-                                # 解析价格
-                                if re.search(r'\d+\.?\d*', text) and price is None:
-                                    price_match = re.search(r'(\d+,?\d*\.?\d*)', text.replace(',', ''))
-                                    if price_match:
-                                        try:
-                                            price = float(price_match.group(1))
-                                        except ValueError:
-                                            continue
-                                
-                                # 解析变化
-                                if ('%' in text or '+' in text or '-' in text) and change is None:
-                                    change = text
-                            
-                            if first_cell and price is not None:
-                                commodities.append({
-                                    'name': first_cell,
-                                    'price': price,
-                                    'change': change,
-                                    'source': 'bloomberg.com',
-                                    'method': 'table_extraction',
-                                    'timestamp': datetime.now().isoformat()
-                                })
+                # 查找商品信息：先只取首列文本，表头等无效行不再读取其余单元格
+                first_cell = cells[0].get_text(strip=True)
+                if not first_cell or len(first_cell) <= 2 or first_cell.isdigit():
+                    continue
+                first_lower = first_cell.lower()
+                if any(word in first_lower for word in HEADER_WORDS):
+                    continue
+                
+                price = None
+                change = None
+                
+                for cell in cells[1:]:
+                    text = cell.get_text(strip=True)
+                    
+                    # 解析价格
+                    if price is None and HAS_NUMBER_RE.search(text):
+                        price_match = PRICE_RE.search(text.replace(',', ''))
+                        if price_match:
+                            try:
+                                price = float(price_match.group(1))
+                            except ValueError:
+                                continue
+                    
+                    # 解析变化
+                    if ('%' in text or '+' in text or '-' in text) and change is None:
+                        change = text
+                
+                if price is not None:
+                    commodities.append({
+                        'name': first_cell,
+                        'price': price,
+                        'change': change,
+                        'source': 'bloomberg.com',
+                        'method': 'table_extraction',
+                        'timestamp': scraped_at
+                    })
             
             # 方法2: 查找Bloomberg特定的数据结构
             print(f"\n🔍 尝试Bloomberg特定数据结构...")
             
             # Bloomberg通常使用特定的CSS类名
-            bloomberg_rows = soup.find_all('tr', class_=lambda x: x and 'data-table-row' in x)
+            # data-table-row 是完整类名（无哈希后缀），直接按类名匹配即可，无需逐个类名调用函数
+            bloomberg_rows = soup.find_all('tr', class_='data-table-row')
             if not bloomberg_rows:
-                bloomberg_rows = soup.find_all('div', class_=lambda x: x and 'row' in x and 'data' in x)
+                bloomberg_rows = DATA_ROW_SELECTOR.select(soup)
             
             print(f"   找到Bloomberg数据行: {len(bloomberg_rows)}")
             
             for row in bloomberg_rows:
                 try:
-                    # 查找名称单元格
-                    name_cell = row.find(['td', 'th', 'div'], attrs={'data-type': 'name'})
-                    if not name_cell:
-                        name_cell = row.find(['td', 'th', 'div'], class_=lambda x: x and 'name' in x)
-                    
-                    # 查找价格单元格
-                    price_cell = row.find(['td', 'div'], attrs={'data-type': 'value'})
-                    if not price_cell:
-                        price_cell = row.find(['td', 'div'], class_=lambda x: x and 'price' in x)
-                    
-                    # 查找变化单元格
-                    change_cell = row.find(['td', 'div'], attrs={'data-type': 'percentChange'})
-                    if not change_cell:
-                        change_cell = row.find(['td', 'div'], class_=lambda x: x and 'change' in x)
+                    # 查找名称、价格、变化单元格
+                    name_cell = select_first(row, NAME_SELECTORS)
+                    price_cell = select_first(row, PRICE_SELECTORS)
+                    change_cell = select_first(row, CHANGE_SELECTORS)
                     
                     if name_cell and price_cell:
                         name = name_cell.get_text(strip=True)
@@ -174,7 +203,7 @@ def test_bloomberg_scraping():
                         change_text = change_cell.get_text(strip=True) if change_cell else None
                         
                         # 解析价格
-                        price_match = re.search(r'(\d+,?\d*\.?\d*)', price_text.replace(',', ''))
+                        price_match = PRICE_RE.search(price_text.replace(',', ''))
                         if price_match:
                             price = float(price_match.group(1))
                             
@@ -184,7 +213,7 @@ def test_bloomberg_scraping():
                                 'change': change_text,
                                 'source': 'bloomberg.com',
                                 'method': 'bloomberg_structure',
-                                'timestamp': datetime.now().isoformat()
+                                'timestamp': scraped_at
                             })
                             
                 except Exception as e:
@@ -194,22 +223,20 @@ def test_bloomberg_scraping():
             # 方法3: 尝试从JavaScript数据中提取
             print(f"\n🔍 尝试从JavaScript数据提取...")
             
-            for script in json_scripts[:3]:  # 只检查前3个脚本以避免过长输出
-                script_text = script.string
-                if script_text:
-                    try:
-                        # 查找可能的JSON对象
-                        json_matches = re.findall(r'\{[^{}]*"price"[^{}]*\}', script_text)
-                        if json_matches:
-                            print(f"   发现 {len(json_matches)} 个可能的JSON价格对象")
+            for script_text in json_scripts[:3]:  # 只检查前3个脚本以避免过长输出
+                try:
+                    # 查找可能的JSON对象
+                    json_matches = JSON_PRICE_RE.findall(script_text)
+                    if json_matches:
+                        print(f"   发现 {len(json_matches)} 个可能的JSON价格对象")
+                    
+                    # 查找商品名称和价格的模式
+                    commodity_patterns = COMMODITY_PATTERN_RE.findall(script_text)
+                    if commodity_patterns:
+                        print(f"   发现 {len(commodity_patterns)} 个商品模式")
                         
-                        # 查找商品名称和价格的模式
-                        commodity_patterns = re.findall(r'"([A-Z]{2,})"[^"]*"(\d+\.?\d*)"', script_text)
-                        if commodity_patterns:
-                            print(f"   发现 {len(commodity_patterns)} 个商品模式")
-                            
-                    except Exception as e:
-                        logger.warning(f"解析JavaScript失败: {e}")
+                except Exception as e:
+                    logger.warning(f"解析JavaScript失败: {e}")
             
             print(f"\n📈 提取结果:")
             if commodities:
@@ -221,10 +248,12 @@ def test_bloomberg_scraping():
                     print(f"   {i+1}. {commodity['name']}: ${commodity['price']} ({commodity.get('change', 'N/A')}) [{commodity['method']}]")
                 
                 # 保存数据
-                df = pd.DataFrame(commodities)
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 csv_file = f'reports/bloomberg_test_{timestamp}.csv'
-                df.to_csv(csv_file, index=False, encoding='utf-8-sig')
+                with open(csv_file, 'w', encoding='utf-8-sig', newline='') as f:
+                    writer = csv.DictWriter(f, fieldnames=commodities[0].keys())
+                    writer.writeheader()
+                    writer.writerows(commodities)
                 print(f"\n💾 数据已保存到: {csv_file}")
                 
                 return True, commodities
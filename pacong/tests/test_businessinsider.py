@@ -5,7 +5,7 @@
 
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
+import csv
 from datetime import datetime
 import re
 import logging
@@ -14,6 +14,12 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 价格解析用的正则，避免在逐行循环中重复查找编译缓存
+HAS_NUMBER_RE = re.compile(r'\d+\.?\d*')
+PRICE_RE = re.compile(r'(\d+,?\d*\.?\d*)')
+# 首列含这些词的行视为表头
+HEADER_WORDS = ('commodity', 'price')
+
 def test_businessinsider_scraping():
     """测试Business Insider商品页面爬取"""
     
@@ -37,14 +43,14 @@ def test_businessinsider_scraping():
         print(f"🔗 Content-Type: {response.headers.get('Content-Type', 'Unknown')}")
         
         if response.status_code == 200:
-            # 解析页面
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 保存页面源码供分析
+            # 保存页面源码供分析（直接写原始响应，不再对整棵树做prettify）
             with open('reports/businessinsider_source.html', 'w', encoding='utf-8') as f:
-                f.write(soup.prettify())
+                f.write(response.text)
             print("💾 页面源码已保存到 reports/businessinsider_source.html")
             
+            # 解析页面
+            soup = BeautifulSoup(response.content, 'lxml')
+            
             # 分析页面结构
             print(f"\n📊 页面结构分析:")
             print(f"   标题: {soup.title.text if soup.title else 'No title'}")
@@ -53,54 +59,53 @@ def test_businessinsider_scraping():
             
             # 尝试提取商品数据
             commodities = []
+            scraped_at = datetime.now().isoformat()  # 本次爬取所有行共用同一时间戳
             
             # 查找表格数据
             tables = soup.find_all('table')
             print(f"\n🔍 找到 {len(tables)} 个表格，正在分析...")
             
-            for i, table in enumerate(tables):
-                rows = table.find_all('tr')
-                print(f"   表格 {i+1}: {len(rows)} 行")
+            # 所有表格行一次选出，不再逐个表格查找
+            for row in soup.select('table tr'):
+                cells = row.find_all(['td', 'th'])
+                if len(cells) < 3:
+                    continue
+                
+                # 简单过滤：先只取首列文本，表头等无效行不再读取其余单元格
+                first_cell = cells[0].get_text(strip=True)
+                if not first_cell or len(first_cell) <= 2 or first_cell.isdigit():
+                    continue
+                first_lower = first_cell.lower()
+                if any(word in first_lower for word in HEADER_WORDS):
+                    continue
+                
+                price = None
+                change = None
+                
+                for cell in cells[1:]:
+                    text = cell.get_text(strip=True)
+                    
+                    # 尝试解析价格
+                    if price is None and HAS_NUMBER_RE.search(text):
+                        price_match = PRICE_RE.search(text.replace(',', ''))
+                        if price_match:
+                            try:
+                                price = float(price_match.group(1))
+                            except ValueError:
+                                continue
+                    
+                    # 查找变化百分比
+                    if ('%' in text or '+' in text or '-' in text) and change is None:
+                        change = text
                 
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 3:
-                        cell_texts = [cell.get_text(strip=True) for cell in cells]
-                        
-                        # 简单过滤，查找包含商品信息的行
-                        first_cell = cell_texts[0]
-                        if (first_cell and 
-                            len(first_cell) > 2 and 
-                            not first_cell.isdigit() and
-                            'commodity' not in first_cell.lower() and
-                            'price' not in first_cell.lower()):
-                            
-                            # 查找价格信息
-                            price = None
-                            change = None
-                            
-                            for text in cell_texts[1:]:
-                                # 尝试解析价格
-                                if re.search(r'\d+\.?\d*', text) and price is None:
-                                    price_match = re.search(r'(\d+,?\d*\.?\d*)', text.replace(',', ''))
-                                    if price_match:
-                                        try:
-                                            price = float(price_match.group(1))
-                                        except ValueError:
-                                            continue
-                                
-                                # 查找变化百分比
-                                if ('%' in text or '+' in text or '-' in text) and change is None:
-                                    change = text
-                            
-                            if first_cell and price is not None:
-                                commodities.append({
-                                    'name': first_cell,
-                                    'price': price,
-                                    'change': change,
-                                    'source': 'businessinsider.com',
-                                    'timestamp': datetime.now().isoformat()
-                                })
+                if price is not None:
+                    commodities.append({
+                        'name': first_cell,
+                        'price': price,
+                        'change': change,
+                        'source': 'businessinsider.com',
+                        'timestamp': scraped_at
+                    })
             
             print(f"\n📈 提取结果:")
             if commodities:
@@ -112,10 +117,12 @@ def test_businessinsider_scraping():
                     print(f"   {i+1}. {commodity['name']}: ${commodity['price']} ({commodity.get('change', 'N/A')})")
                 
                 # 保存到CSV
-                df = pd.DataFrame(commodities)
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 csv_file = f'reports/businessinsider_test_{timestamp}.csv'
-                df.to_csv(csv_file, index=False, encoding='utf-8-sig')
+                with open(csv_file, 'w', encoding='utf-8-sig', newline='') as f:
+                    writer = csv.DictWriter(f, fieldnames=commodities[0].keys())
+                    writer.writeheader()
+                    writer.writerows(commodities)
                 print(f"\n💾 数据已保存到: {csv_file}")
                 
                 return True, commodities